@@ -0,0 +1,73 @@
+"""
+Cache for OrderDetailSchema payloads (model_dump() output, encoded like ninja's renderer).
+Reads go through get_cached_order_detail(); every write path that changes what the
+detail schema renders must call invalidate_order_detail().
+Each payload is stored with its digest so conditional GETs never rebuild the schema.
+Fields derived from the current time are left out and recomputed on every read,
+the ETag combines the stored digest with their current values.
+"""
+import hashlib
+import json
+from types import SimpleNamespace
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import quote_etag
+from ninja.responses import NinjaJSONEncoder
+
+# Seconds a cached detail payload lives, bounds staleness if an invalidation is missed
+ORDER_DETAIL_TIMEOUT = 300
+
+# OrderDetailSchema fields computed from timezone.now(), never cached
+TIME_DEPENDENT_FIELDS = ('is_overdue', 'remaining_minutes')
+
+
+def order_detail_key(order_id: int) -> str:
+    return f'order:{order_id}:detail'
+
+
+def get_cached_order_detail(order_id: int) -> Optional[Tuple[str, dict]]:
+    """Return the cached (etag, payload) of an order, or None on a miss."""
+    cached = cache.get(order_detail_key(order_id))
+    if cached is None:
+        return None
+
+    digest, payload = cached
+    payload = with_time_fields(payload)
+    return _detail_etag(digest, payload), payload
+
+
+def with_time_fields(payload: dict) -> dict:
+    """Copy of a cached payload with its time-dependent fields computed for now."""
+    from apps.orders.schemas.output_schema import OrderDetailSchema
+
+    order = SimpleNamespace(status=payload['status'], deadline=payload['deadline'])
+    return {
+        **payload,
+        'is_overdue': OrderDetailSchema.resolve_is_overdue(order),
+        'remaining_minutes': OrderDetailSchema.resolve_remaining_minutes(order),
+    }
+
+
+def cache_order_detail(order_id: int, payload: dict) -> str:
+    """Cache the time-independent part of a detail payload, returns the payload's ETag."""
+    stable = {key: value for key, value in payload.items() if key not in TIME_DEPENDENT_FIELDS}
+    digest = hashlib.md5(json.dumps(stable, sort_keys=True, cls=NinjaJSONEncoder).encode(), usedforsecurity=False).hexdigest()
+    cache.set(order_detail_key(order_id), (digest, stable), ORDER_DETAIL_TIMEOUT)
+    return _detail_etag(digest, payload)
+
+
+def _detail_etag(digest: str, payload: dict) -> str:
+    """ETag that changes whenever the countdown or overdue state does."""
+    return quote_etag(f"{digest}-{int(payload['is_overdue'])}-{payload['remaining_minutes']}")
+
+
+def invalidate_order_detail(*order_ids: int):
+    """
+    Drop cached detail payloads.
+    Runs after commit so a concurrent read can't re-cache the pre-write row.
+    """
+    keys = [order_detail_key(order_id) for order_id in order_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,246 @@
+"""
+PDF/Word rendering for order exports.
+Renderers take an order loaded by OrderService.get_order_for_export() plus its
+load_item_rows() and return a BytesIO positioned at 0. They don't touch the
+database, so they can run on any thread. Export jobs run them on a background pool
+and keep the finished file in the cache until it is downloaded.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.cache import cache
+from django.db import connection
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches
+from reportlab.lib.pagesizes import A4, A5
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+# Seconds a finished export file is kept for download
+EXPORT_RESULT_TIMEOUT = 600
+
+PDF_CONTENT_TYPE = 'application/pdf'
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Rendering is CPU bound, a small pool keeps it from starving request threads
+_export_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='order-export')
+
+# Receipt printer roll sizes
+_K80 = (80*mm, 297*mm)
+_K57 = (57*mm, 297*mm)
+_PAGE_SIZES = {'A4': A4, 'A5': A5, 'K80': _K80, 'K57': _K57}
+
+# Document titles by export type (PDF uses the ASCII-only built-in Helvetica)
+_PDF_TITLES = {
+    'order_bill': 'PHIEU DAT HANG',
+    'weighing_receipt': 'PHIEU CAN HANG',
+    'payment_bill': 'HOA DON THANH TOAN',
+    'delivery_note': 'PHIEU GIAO HANG'
+}
+_DOCX_TITLES = {
+    'order_bill': 'PHIẾU ĐẶT HÀNG',
+    'weighing_receipt': 'PHIẾU CÂN HÀNG',
+    'payment_bill': 'HÓA ĐƠN THANH TOÁN',
+    'delivery_note': 'PHIẾU GIAO HÀNG'
+}
+
+# PDF line per item: name - quantity unit x price = total
+_PDF_ITEM_LINE = "{0} - {1} {2} x {3:,.0f}d = {4:,.0f}d"
+
+
+def load_item_rows(order):
+    """(product_name, quantity, unit, price, total) per item, as plain tuples from one SELECT."""
+    # product_name is stored on the item, so no product JOIN is needed
+    return list(order.items.values_list('product_name', 'quantity', 'unit', 'price', 'total'))
+
+
+def render_order_pdf(order, items, type: str = "order_bill", size: str = "K80"):
+    """Render an order as PDF."""
+    buffer = BytesIO()
+    pagesize = _PAGE_SIZES.get(size, _K57)
+
+    p = canvas.Canvas(buffer, pagesize=pagesize)
+    width, height = pagesize
+
+    # Use Helvetica (built-in font)
+    p.setFont('Helvetica', 10)
+
+    # Draw content
+    y_position = height - 40
+
+    # Header
+    p.setFont('Helvetica-Bold', 14)
+    title = _PDF_TITLES.get(type, 'HOA DON')
+
+    p.drawCentredString(width/2, y_position, title)
+    y_position -= 30
+
+    # Order info
+    p.setFont('Helvetica', 10)
+    p.drawString(20, y_position, f"Ma don: {order.order_number}")
+    y_position -= 20
+    p.drawString(20, y_position, f"Khach hang: {order.customer_name}")
+    y_position -= 20
+    p.drawString(20, y_position, f"SDT: {order.customer_phone}")
+    y_position -= 20
+    p.drawString(20, y_position, f"Dia chi: {order.customer_address}")
+    y_position -= 30
+
+    # Items
+    p.setFont('Helvetica-Bold', 10)
+    p.drawString(20, y_position, "San pham:")
+    y_position -= 20
+
+    p.setFont('Helvetica', 9)
+    for item_text in [_PDF_ITEM_LINE.format(*row) for row in items]:
+        p.drawString(30, y_position, item_text)
+        y_position -= 15
+
+    y_position -= 10
+
+    # Totals
+    p.setFont('Helvetica', 10)
+    p.drawString(20, y_position, f"Tam tinh: {order.subtotal:,.0f}d")
+    y_position -= 15
+    p.drawString(20, y_position, f"Phi van chuyen: {order.shipping_fee:,.0f}d")
+    y_position -= 15
+    p.drawString(20, y_position, f"Phi chip: {order.chip_fee:,.0f}d")
+    y_position -= 20
+
+    p.setFont('Helvetica-Bold', 12)
+    p.drawString(20, y_position, f"Tong cong: {order.total:,.0f}d")
+
+    p.showPage()
+    p.save()
+
+    buffer.seek(0)
+    return buffer
+
+
+def render_order_docx(order, items, type: str = "order_bill", size: str = "A4"):
+    """Render an order as Word document."""
+    # Create Word document
+    doc = Document()
+
+    # Set page margins for size
+    sections = doc.sections
+    for section in sections:
+        if size == "A5":
+            section.page_height = Inches(8.27)
+            section.page_width = Inches(5.83)
+        # A4 is default
+        section.top_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+
+    # Title
+    title = _DOCX_TITLES.get(type, 'HÓA ĐƠN')
+
+    heading = doc.add_heading(title, 0)
+    heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # Order info
+    doc.add_paragraph(f"Mã đơn: {order.order_number}")
+    doc.add_paragraph(f"Khách hàng: {order.customer_name}")
+    doc.add_paragraph(f"Số điện thoại: {order.customer_phone}")
+    doc.add_paragraph(f"Địa chỉ: {order.customer_address}")
+
+    if order.delivery_time:
+        doc.add_paragraph(f"Thời gian giao: {order.delivery_time.strftime('%d/%m/%Y %H:%M')}")
+
+    # Items table
+    doc.add_paragraph()
+    doc.add_heading('Sản phẩm:', level=2)
+
+    table = doc.add_table(rows=1, cols=5)
+    table.style = 'Light Grid Accent 1'
+
+    # Header row
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = 'STT'
+    hdr_cells[1].text = 'Sản phẩm'
+    hdr_cells[2].text = 'Số lượng'
+    hdr_cells[3].text = 'Đơn giá'
+    hdr_cells[4].text = 'Thành tiền'
+
+    # Data rows
+    for idx, (product_name, quantity, unit, price, total) in enumerate(items, 1):
+        row_cells = table.add_row().cells
+        row_cells[0].text = str(idx)
+        row_cells[1].text = product_name
+        row_cells[2].text = f"{quantity} {unit}"
+        row_cells[3].text = f"{price:,.0f}đ"
+        row_cells[4].text = f"{total:,.0f}đ"
+
+    # Totals
+    doc.add_paragraph()
+    doc.add_paragraph(f"Tạm tính: {order.subtotal:,.0f}đ")
+    doc.add_paragraph(f"Phí vận chuyển: {order.shipping_fee:,.0f}đ")
+    doc.add_paragraph(f"Phí chip: {order.chip_fee:,.0f}đ")
+
+    total_para = doc.add_paragraph()
+    total_para.add_run(f"Tổng cộng: {order.total:,.0f}đ").bold = True
+
+    # Notes
+    if order.notes:
+        doc.add_paragraph()
+        doc.add_heading('Ghi chú:', level=2)
+        doc.add_paragraph(order.notes)
+
+    # Save to buffer
+    buffer = BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+# format -> (renderer, file extension, content type)
+EXPORT_FORMATS = {
+    'pdf': (render_order_pdf, 'pdf', PDF_CONTENT_TYPE),
+    'docx': (render_order_docx, 'docx', DOCX_CONTENT_TYPE),
+}
+
+
+def _export_job_key(job_id: str) -> str:
+    return f'order-export:{job_id}'
+
+
+def _run_export_job(job_id: str, order_id: int, format: str, type: str, size: str):
+    """Render an export on the pool and store the result (or error) in the cache."""
+    from apps.orders.repositories.repository_a import OrderRepository
+
+    renderer, extension, content_type = EXPORT_FORMATS[format]
+    try:
+        order = OrderRepository.get_order_for_export(order_id)
+        if not order:
+            result = {'status': 'failed', 'detail': f"Order with ID {order_id} not found"}
+        else:
+            result = {
+                'status': 'done',
+                'filename': f"{order.order_number}_{type}.{extension}",
+                'content_type': content_type,
+                'content': renderer(order, load_item_rows(order), type, size).getvalue(),
+            }
+    except Exception as e:
+        result = {'status': 'failed', 'detail': str(e)}
+    finally:
+        # Pool threads aren't request-scoped, release their DB connection here
+        connection.close()
+
+    cache.set(_export_job_key(job_id), result, EXPORT_RESULT_TIMEOUT)
+
+
+def submit_export(order_id: int, format: str, type: str, size: str) -> str:
+    """Queue an export job, returns the job id to poll with get_export()."""
+    job_id = uuid.uuid4().hex
+    cache.set(_export_job_key(job_id), {'status': 'pending'}, EXPORT_RESULT_TIMEOUT)
+    _export_executor.submit(_run_export_job, job_id, order_id, format, type, size)
+    return job_id
+
+
+def get_export(job_id: str):
+    """Return the job state dict ('pending' / 'done' / 'failed'), or None if unknown or expired."""
+    return cache.get(_export_job_key(job_id))
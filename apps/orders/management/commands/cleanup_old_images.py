@@ -5,11 +5,30 @@ Usage:
     python manage.py cleanup_old_images --days 30 --dry-run
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.conf import settings
 from apps.orders.models import OrderImage
+from apps.orders.cache import invalidate_order_detail
+
+# Max rows removed per DELETE statement, keeps transactions and lock time bounded
+DELETE_BATCH_SIZE = 5000
+
+# Threads used to unlink files; unlink is I/O bound so the GIL isn't a bottleneck
+UNLINK_WORKERS = 16
+
+
+def _safe_unlink(path):
+    """Remove a file, returns the OSError on failure (a missing file counts as removed)."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return e
+    return None
 
 
 class Command(BaseCommand):
@@ -28,6 +47,36 @@ class Command(BaseCommand):
             help='Preview what would be deleted without actually deleting'
         )
 
+    def _delete_records(self, image_ids):
+        """Delete a batch of OrderImage rows, returns number of rows deleted."""
+        # Plain DELETE without the cascade collector / per-row signals.
+        # OrderImage has no reverse relations, so nothing else needs cleanup.
+        delete_qs = OrderImage.objects.filter(id__in=image_ids)
+        return delete_qs._raw_delete(delete_qs.db)
+
+    def _delete_batch(self, executor, batch):
+        """
+        Unlink the files of a batch in parallel, then delete their DB rows.
+        batch is a list of (image_id, order_id, path, size) - path is None when there is no file.
+        Rows whose file could not be removed are kept.
+        Returns (deleted, failed, bytes freed by the files actually removed).
+        """
+        files = [(path, size) for _, _, path, size in batch if path]
+        failed_paths = set()
+        freed = 0
+        paths = [path for path, _ in files]
+        for (path, size), error in zip(files, executor.map(_safe_unlink, paths)):
+            if error is not None:
+                failed_paths.add(path)
+                self.stdout.write(self.style.ERROR(f'  - Failed to delete {path}: {error}'))
+            else:
+                freed += size
+
+        kept = [(image_id, order_id) for image_id, order_id, path, _ in batch if path not in failed_paths]
+        deleted = self._delete_records([image_id for image_id, _ in kept]) if kept else 0
+        invalidate_order_detail(*{order_id for _, order_id in kept})
+        return deleted, len(failed_paths), freed
+
     def handle(self, *args, **options):
         days = options['days']
         dry_run = options['dry_run']
@@ -37,62 +86,96 @@ class Command(BaseCommand):
 
         # Get old images
         old_images = OrderImage.objects.filter(created_at__lt=cutoff_date)
-        total_count = old_images.count()
 
-        if total_count == 0:
+        # EXISTS is enough for the early exit; the real run derives its totals
+        # from the rows it walks and the DELETE results instead of a COUNT(*)
+        if not old_images.exists():
             self.stdout.write(
                 self.style.SUCCESS(f'No images older than {days} days found.')
             )
             return
 
-        # Calculate total size
+        # Size of the old files (dry run) or of the files actually removed
         total_size = 0
+        total_count = 0
         deleted_count = 0
         failed_count = 0
 
-        self.stdout.write(
-            self.style.WARNING(f'\nFound {total_count} images older than {days} days.')
-        )
-
         if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\nFound {old_images.count()} images older than {days} days.'
+                )
+            )
             self.stdout.write(
                 self.style.NOTICE('\n=== DRY RUN MODE - Nothing will be deleted ===\n')
             )
+        else:
+            self.stdout.write(
+                self.style.WARNING(f'\nDeleting images older than {days} days...')
+            )
 
-        for image in old_images:
-            try:
-                # Get file size
-                if image.image and os.path.exists(image.image.path):
-                    file_size = os.path.getsize(image.image.path)
-                    total_size += file_size
+        # (id, order id, file path, size) queued for removal, path is None when the file is missing
+        pending = []
 
-                    self.stdout.write(
-                        f'  - {image.image.name} ({file_size / 1024:.2f} KB) '
-                        f'from Order #{image.order.order_number} '
-                        f'created on {image.created_at.strftime("%Y-%m-%d")}'
-                    )
+        # JOIN the order up front so printing order numbers doesn't hit the DB per row
+        images_with_order = old_images.select_related('order').only(
+            'id', 'image', 'created_at', 'order__order_number'
+        )
 
-                    if not dry_run:
-                        # Delete physical file
-                        image.image.delete(save=False)
-                        # Delete database record
-                        image.delete()
-                        deleted_count += 1
-                else:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f'  - File not found: {image.image.name} (deleting DB record only)'
+        with ThreadPoolExecutor(max_workers=UNLINK_WORKERS) as executor:
+            # iterator() streams rows instead of caching the whole result set
+            for image in images_with_order.iterator(chunk_size=1000):
+                total_count += 1
+                try:
+                    # Get file size (single stat call, None when the file is missing)
+                    file_size = None
+                    if image.image:
+                        image_path = image.image.path
+                        try:
+                            file_size = os.stat(image_path).st_size
+                        except FileNotFoundError:
+                            pass
+
+                    if file_size is not None:
+                        self.stdout.write(
+                            f'  - {image.image.name} ({file_size / 1024:.2f} KB) '
+                            f'from Order #{image.order.order_number} '
+                            f'created on {image.created_at.strftime("%Y-%m-%d")}'
                         )
+
+                        if dry_run:
+                            total_size += file_size
+                        else:
+                            pending.append((image.id, image.order_id, image_path, file_size))
+                    else:
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f'  - File not found: {image.image.name} (deleting DB record only)'
+                            )
+                        )
+                        if not dry_run:
+                            pending.append((image.id, image.order_id, None, 0))
+
+                except Exception as e:
+                    failed_count += 1
+                    self.stdout.write(
+                        self.style.ERROR(f'  - Failed to delete {image.image.name}: {str(e)}')
                     )
-                    if not dry_run:
-                        image.delete()
-                        deleted_count += 1
-
-            except Exception as e:
-                failed_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f'  - Failed to delete {image.image.name}: {str(e)}')
-                )
+
+                # Flush in bounded batches so disk unlinks and DB deletes interleave
+                if len(pending) >= DELETE_BATCH_SIZE:
+                    deleted, failed, freed = self._delete_batch(executor, pending)
+                    deleted_count += deleted
+                    failed_count += failed
+                    total_size += freed
+                    pending = []
+
+            if pending:
+                deleted, failed, freed = self._delete_batch(executor, pending)
+                deleted_count += deleted
+                failed_count += failed
+                total_size += freed
 
         # Summary
         total_size_mb = total_size / (1024 * 1024)
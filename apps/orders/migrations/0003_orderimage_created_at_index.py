@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-15 11:48
+
+import apps.orders.models.order
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="orderimage",
+            name="image",
+            field=models.ImageField(
+                upload_to=apps.orders.models.order.order_image_upload_path,
+                verbose_name="Hình ảnh",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="orderimage",
+            index=models.Index(
+                fields=["created_at"], name="order_image_created_860e08_idx"
+            ),
+        ),
+    ]
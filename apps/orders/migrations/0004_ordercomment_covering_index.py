@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-15 11:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_orderimage_created_at_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ordercomment",
+            name="order_comme_order_i_29f41c_idx",
+        ),
+        migrations.AddIndex(
+            model_name="ordercomment",
+            index=models.Index(
+                fields=["order", "created_at"],
+                include=("user", "is_edited", "is_system_message", "updated_at"),
+                name="orc_order_created_covering",
+            ),
+        ),
+    ]
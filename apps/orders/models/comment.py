@@ -44,7 +44,14 @@ class OrderComment(models.Model):
         db_table = 'order_comments'
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['order', 'created_at']),
+            # Covering index for the chat thread query (PostgreSQL INCLUDE).
+            # Only fixed-width columns are included: message/image can exceed
+            # the btree tuple size limit.
+            models.Index(
+                fields=['order', 'created_at'],
+                include=['user', 'is_edited', 'is_system_message', 'updated_at'],
+                name='orc_order_created_covering',
+            ),
             models.Index(fields=['user', 'created_at']),
         ]
 
@@ -338,6 +338,9 @@ class OrderImage(BaseModel):
         db_table = 'order_images'
         verbose_name = 'Hình ảnh đơn hàng'
         verbose_name_plural = 'Hình ảnh đơn hàng'
+        indexes = [
+            models.Index(fields=['created_at']),  # For cleanup of old images
+        ]
 
     def __str__(self):
         return f"{self.order.order_number} - {self.get_image_type_display()}"
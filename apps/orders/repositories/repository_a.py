@@ -1,8 +1,52 @@
 """Order repository."""
 from typing import List, Optional
-from django.db.models import Q, Prefetch, Count
-from apps.orders.models import Order, OrderItem, OrderImage
+from django.db.models import Q, Prefetch, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.orders.models import Order, OrderItem, OrderImage, OrderStatusHistory
 from apps.orders.schemas.input_schema import OrderFilterSchema
+from apps.users.models import User
+
+# Columns rendered by UserBasicSchema for assigned users
+USER_BASIC_FIELDS = ('id', 'username', 'first_name', 'last_name')
+
+# Columns rendered by OrderItemSchema / OrderImageSchema / OrderStatusHistorySchema
+# ('order' is needed so prefetched rows can be matched back to their order)
+ORDER_ITEM_FIELDS = (
+    'id', 'order', 'product_name', 'quantity', 'unit', 'price', 'total', 'note',
+)
+ORDER_IMAGE_FIELDS = (
+    'id', 'order', 'image', 'image_type', 'created_at',
+    *(f'uploaded_by__{f}' for f in USER_BASIC_FIELDS),
+)
+STATUS_HISTORY_FIELDS = (
+    'id', 'order', 'from_status', 'to_status', 'notes', 'created_at',
+    *(f'changed_by__{f}' for f in USER_BASIC_FIELDS),
+)
+
+
+def _order_detail_prefetches():
+    """Prefetches for everything OrderDetailSchema renders."""
+    return [
+        Prefetch('assigned_to', queryset=User.objects.only(*USER_BASIC_FIELDS)),
+        # Items render the denormalized product_name, product itself isn't loaded
+        Prefetch('items', queryset=OrderItem.objects.only(*ORDER_ITEM_FIELDS)),
+        Prefetch(
+            'images',
+            queryset=OrderImage.objects.select_related('uploaded_by').only(*ORDER_IMAGE_FIELDS)
+        ),
+        Prefetch(
+            'status_history',
+            queryset=OrderStatusHistory.objects.select_related('changed_by').only(*STATUS_HISTORY_FIELDS)
+        ),
+    ]
+
+
+def _related_count(model):
+    """Correlated COUNT(*) of `model` rows belonging to the outer order."""
+    counts = model.objects.filter(
+        order=OuterRef('pk')
+    ).order_by().values('order').annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(counts), 0)
 
 
 class OrderRepository:
@@ -11,15 +55,16 @@ class OrderRepository:
     @staticmethod
     def get_all_orders(filters: OrderFilterSchema, user_id: Optional[int] = None):
         """Get all orders with filters."""
+        # created_by is a FK -> JOIN; assigned_to is M2M -> separate prefetch.
+        # The list schema only shows item/image counts, so those rows aren't loaded.
         queryset = Order.objects.select_related(
             'created_by'
         ).prefetch_related(
-            'assigned_to',
-            'items',
-            'images'
+            Prefetch('assigned_to', queryset=User.objects.only(*USER_BASIC_FIELDS))
         ).annotate(
-            items_count=Count('items', distinct=True),
-            images_count=Count('images', distinct=True)
+            # Per-order subqueries instead of JOIN + COUNT(DISTINCT) + GROUP BY
+            items_count=_related_count(OrderItem),
+            images_count=_related_count(OrderImage)
         )
 
         # Apply filters
@@ -37,48 +82,12 @@ class OrderRepository:
                 Q(customer_phone__icontains=filters.search)
             )
 
+        # date_from / date_to arrive as aware day boundaries (see OrderFilterSchema)
         if filters.date_from:
-            # Convert to timezone-aware datetime at start of day
-            from django.utils import timezone as tz
-            from datetime import datetime, time
-
-            # If date_from is a string, parse it
-            if isinstance(filters.date_from, str):
-                date_obj = datetime.fromisoformat(filters.date_from.replace('Z', '+00:00'))
-                if date_obj.tzinfo is None:
-                    # Make it timezone-aware at start of day
-                    date_obj = tz.make_aware(datetime.combine(date_obj.date(), time.min))
-                start_date = date_obj
-            else:
-                # Already a datetime object
-                if filters.date_from.tzinfo is None:
-                    start_date = tz.make_aware(datetime.combine(filters.date_from.date(), time.min))
-                else:
-                    start_date = filters.date_from
-
-            queryset = queryset.filter(created_at__gte=start_date)
+            queryset = queryset.filter(created_at__gte=filters.date_from)
 
         if filters.date_to:
-            # Include entire day by using end of day (23:59:59)
-            from django.utils import timezone as tz
-            from datetime import datetime, time, timedelta
-
-            # If date_to is a string, parse it
-            if isinstance(filters.date_to, str):
-                date_obj = datetime.fromisoformat(filters.date_to.replace('Z', '+00:00'))
-                if date_obj.tzinfo is None:
-                    # Make it timezone-aware at end of day
-                    date_obj = tz.make_aware(datetime.combine(date_obj.date(), time.max))
-                end_date = date_obj
-            else:
-                # Already a datetime object
-                if filters.date_to.tzinfo is None:
-                    end_date = tz.make_aware(datetime.combine(filters.date_to.date(), time.max))
-                else:
-                    # Add full day
-                    end_date = filters.date_to.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            queryset = queryset.filter(created_at__lte=end_date)
+            queryset = queryset.filter(created_at__lte=filters.date_to)
 
         return queryset
 
@@ -89,14 +98,24 @@ class OrderRepository:
             return Order.objects.select_related(
                 'created_by'
             ).prefetch_related(
-                'assigned_to',
-                'items__product',
-                'images',
-                'status_history'
+                *_order_detail_prefetches()
             ).get(id=order_id)
         except Order.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_order_for_export(order_id: int) -> Optional[Order]:
+        """Get order for PDF/Word exports (items are read as tuples by the renderers)."""
+        try:
+            return Order.objects.get(id=order_id)
+        except Order.DoesNotExist:
+            return None
+
+    @staticmethod
+    def order_exists(order_id: int) -> bool:
+        """Check an order exists without loading it."""
+        return Order.objects.filter(id=order_id).exists()
+
     @staticmethod
     def get_order_by_number(order_number: str) -> Optional[Order]:
         """Get order by order number."""
@@ -123,9 +142,26 @@ class OrderRepository:
         """Delete an order (soft delete if needed)."""
         order.delete()
 
+    @staticmethod
+    def get_order_image(order_id: int, image_id: int) -> Optional[OrderImage]:
+        """Get an image belonging to an order."""
+        return OrderImage.objects.filter(id=image_id, order_id=order_id).first()
+
+    @staticmethod
+    def get_order_image_ids(order_id: int) -> List[int]:
+        """Get IDs of all images of an order."""
+        return list(OrderImage.objects.filter(order_id=order_id).values_list('id', flat=True))
+
     @staticmethod
     def get_order_images(order: Order, image_type: Optional[str] = None) -> List[OrderImage]:
         """Get order images by type."""
+        # Reuse the images prefetched by get_order_by_id instead of a new query
+        if 'images' in getattr(order, '_prefetched_objects_cache', {}):
+            images = order.images.all()
+            if image_type:
+                return [image for image in images if image.image_type == image_type]
+            return list(images)
+
         queryset = order.images.all()
         if image_type:
             queryset = queryset.filter(image_type=image_type)
@@ -139,5 +175,4 @@ class OrderRepository:
     @staticmethod
     def count_orders_by_status():
         """Count orders by status."""
-        from django.db.models import Count
         return Order.objects.values('status').annotate(count=Count('id'))
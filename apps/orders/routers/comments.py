@@ -11,15 +11,29 @@ from apps.orders.schemas.comment_schema import (
     CreateCommentSchema,
     UpdateCommentSchema,
     CommentSchema,
-    CommentListResponse
+    CommentListResponse,
+    COMMENT_VALUE_FIELDS,
+    COMMENT_MODEL_FIELDS
+)
+from apps.orders.socketio_client import (
+    broadcast_after_commit,
+    broadcast_comment_created,
+    broadcast_comment_updated,
+    broadcast_comment_deleted
 )
-from apps.orders.socketio_client import broadcast_comment_created, broadcast_comment_updated, broadcast_comment_deleted
 from apps.users.models import User
 from core.dependencies import get_current_user
 
 router = APIRouter(prefix="/orders", tags=["Order Comments"])
 
 
+def _get_comment_for_write(comment_id: int) -> Optional[OrderComment]:
+    """Load a comment for update/delete: user JOINed in, order left as order_id."""
+    return OrderComment.objects.select_related('user').only(
+        *COMMENT_MODEL_FIELDS
+    ).filter(id=comment_id).first()
+
+
 @router.get("/{order_id}/comments", response_model=CommentListResponse)
 def get_order_comments(
     order_id: int,
@@ -29,20 +43,20 @@ def get_order_comments(
     Get all comments for an order.
     Returns comments in chronological order.
     """
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    if not Order.objects.filter(id=order_id).exists():
         raise HTTPException(status_code=404, detail="Order not found")
 
-    comments = OrderComment.objects.filter(order=order).select_related('user').order_by('created_at')
+    # Plain .values() rows -> response dicts; validation is only needed on input
+    rows = OrderComment.objects.filter(order_id=order_id).values(
+        *COMMENT_VALUE_FIELDS
+    ).order_by('created_at')
+    comments = CommentSchema.list_from_values(rows)
 
-    comment_schemas = [CommentSchema.from_orm(comment) for comment in comments]
-
-    return CommentListResponse(
-        comments=comment_schemas,
-        total=len(comment_schemas),
-        order_id=order_id
-    )
+    return {
+        "comments": comments,
+        "total": len(comments),
+        "order_id": order_id
+    }
 
 
 @router.post("/{order_id}/comments", response_model=CommentSchema)
@@ -63,15 +77,13 @@ async def create_comment(
             detail="Must provide either message or image"
         )
 
-    # Get order
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    # Make sure the order exists (only its id is needed)
+    if not Order.objects.filter(id=order_id).exists():
         raise HTTPException(status_code=404, detail="Order not found")
 
     # Create comment
     comment = OrderComment.objects.create(
-        order=order,
+        order_id=order_id,
         user=user,
         message=message or ""
     )
@@ -79,7 +91,7 @@ async def create_comment(
     # Handle image upload if provided
     if image:
         # Save image
-        from django.core.files.base import ContentFile
+        from django.core.files import File
         import os
         from django.utils import timezone
 
@@ -87,17 +99,15 @@ async def create_comment(
         ext = os.path.splitext(image.filename)[1]
         filename = f"comment_{comment.id}_{int(timezone.now().timestamp())}{ext}"
 
-        # Read and save file
-        content = await image.read()
-        comment.image.save(filename, ContentFile(content), save=True)
-
-    comment.refresh_from_db()
+        # Stream the spooled upload into storage instead of reading it into memory.
+        # save=True persists the row and bumps updated_at on the in-memory instance
+        comment.image.save(filename, File(image.file), save=True)
 
     # Broadcast to Socket.IO
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_created(order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_created, order_id, comment_schema.model_dump(mode='json'))
 
-    return CommentSchema.from_orm(comment)
+    return comment_schema
 
 
 @router.put("/comments/{comment_id}", response_model=CommentSchema)
@@ -110,13 +120,12 @@ def update_comment(
     Update a comment (text only).
     Only the comment author can update.
     """
-    try:
-        comment = OrderComment.objects.select_related('user', 'order').get(id=comment_id)
-    except OrderComment.DoesNotExist:
+    comment = _get_comment_for_write(comment_id)
+    if comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
     # Check permission
-    if comment.user != user:
+    if comment.user_id != user.id:
         raise HTTPException(status_code=403, detail="You can only edit your own comments")
 
     # Can't edit system messages
@@ -129,10 +138,10 @@ def update_comment(
     comment.save(update_fields=['message', 'is_edited', 'updated_at'])
 
     # Broadcast update
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_updated(comment.order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_updated, comment.order_id, comment_schema.model_dump(mode='json'))
 
-    return CommentSchema.from_orm(comment)
+    return comment_schema
 
 
 @router.delete("/comments/{comment_id}")
@@ -144,13 +153,12 @@ def delete_comment(
     Delete a comment.
     Only the comment author can delete (or admin).
     """
-    try:
-        comment = OrderComment.objects.select_related('user', 'order').get(id=comment_id)
-    except OrderComment.DoesNotExist:
+    comment = _get_comment_for_write(comment_id)
+    if comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
     # Check permission
-    if comment.user != user and not user.is_staff:
+    if comment.user_id != user.id and not user.is_staff:
         raise HTTPException(status_code=403, detail="You can only delete your own comments")
 
     # Can't delete system messages
@@ -164,7 +172,7 @@ def delete_comment(
     comment.delete()
 
     # Broadcast deletion
-    broadcast_comment_deleted(order_id, comment_id)
+    broadcast_after_commit(broadcast_comment_deleted, order_id, comment_id)
 
     return JSONResponse(
         status_code=200,
@@ -187,19 +195,17 @@ def create_system_comment(
     if not user.is_staff:
         raise HTTPException(status_code=403, detail="Only staff can create system messages")
 
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    if not Order.objects.filter(id=order_id).exists():
         raise HTTPException(status_code=404, detail="Order not found")
 
     comment = OrderComment.objects.create(
-        order=order,
+        order_id=order_id,
         message=message,
         is_system_message=True
     )
 
     # Broadcast
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_created(order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_created, order_id, comment_schema.model_dump(mode='json'))
 
-    return CommentSchema.from_orm(comment)
+    return comment_schema
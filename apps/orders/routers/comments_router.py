@@ -8,9 +8,16 @@ from apps.orders.models import Order, OrderComment
 from apps.orders.schemas.comment_schema import (
     UpdateCommentSchema,
     CommentSchema,
-    CommentListResponse
+    CommentListResponse,
+    COMMENT_VALUE_FIELDS,
+    COMMENT_MODEL_FIELDS
+)
+from apps.orders.socketio_client import (
+    broadcast_after_commit,
+    broadcast_comment_created,
+    broadcast_comment_updated,
+    broadcast_comment_deleted
 )
-from apps.orders.socketio_client import broadcast_comment_created, broadcast_comment_updated, broadcast_comment_deleted
 from apps.users.models import User
 from core.authentication import JWTAuth
 from core.responses.api_response import ErrorResponse
@@ -18,26 +25,33 @@ from core.responses.api_response import ErrorResponse
 comments_router = Router(auth=JWTAuth())
 
 
+def _get_comment_for_write(comment_id: int) -> Optional[OrderComment]:
+    """Load a comment for update/delete: user JOINed in, order left as order_id."""
+    return OrderComment.objects.select_related('user').only(
+        *COMMENT_MODEL_FIELDS
+    ).filter(id=comment_id).first()
+
+
 @comments_router.get("/{order_id}/comments", response={200: CommentListResponse, 404: ErrorResponse})
 def get_order_comments(request, order_id: int):
     """
     Get all comments for an order.
     Returns comments in chronological order.
     """
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    if not Order.objects.filter(id=order_id).exists():
         return 404, {"detail": "Order not found"}
 
-    comments = OrderComment.objects.filter(order=order).select_related('user').order_by('created_at')
+    # Plain .values() rows -> response dicts; validation is only needed on input
+    rows = OrderComment.objects.filter(order_id=order_id).values(
+        *COMMENT_VALUE_FIELDS
+    ).order_by('created_at')
+    comments = CommentSchema.list_from_values(rows)
 
-    comment_schemas = [CommentSchema.from_orm(comment) for comment in comments]
-
-    return 200, CommentListResponse(
-        comments=comment_schemas,
-        total=len(comment_schemas),
-        order_id=order_id
-    )
+    return 200, {
+        "comments": comments,
+        "total": len(comments),
+        "order_id": order_id
+    }
 
 
 @comments_router.post("/{order_id}/comments", response={201: CommentSchema, 400: ErrorResponse, 404: ErrorResponse})
@@ -57,22 +71,19 @@ def create_comment(
     if not message and not image:
         return 400, {"detail": "Must provide either message or image"}
 
-    # Get order
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    # Make sure the order exists (only its id is needed)
+    if not Order.objects.filter(id=order_id).exists():
         return 404, {"detail": "Order not found"}
 
     # Create comment
     comment = OrderComment.objects.create(
-        order=order,
+        order_id=order_id,
         user=user,
         message=message or ""
     )
 
     # Handle image upload if provided
     if image:
-        from django.core.files.base import ContentFile
         import os
         from django.utils import timezone
 
@@ -80,17 +91,15 @@ def create_comment(
         ext = os.path.splitext(image.name)[1]
         filename = f"comment_{comment.id}_{int(timezone.now().timestamp())}{ext}"
 
-        # Read and save file
-        content = image.read()
-        comment.image.save(filename, ContentFile(content), save=True)
-
-    comment.refresh_from_db()
+        # UploadedFile is already a Django File, storage copies it in chunks.
+        # save=True persists the row and bumps updated_at on the in-memory instance
+        comment.image.save(filename, image, save=True)
 
     # Broadcast to Socket.IO
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_created(order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_created, order_id, comment_schema.model_dump(mode='json'))
 
-    return 201, CommentSchema.from_orm(comment)
+    return 201, comment_schema
 
 
 @comments_router.put("/comments/{comment_id}", response={200: CommentSchema, 400: ErrorResponse, 403: ErrorResponse, 404: ErrorResponse})
@@ -101,13 +110,12 @@ def update_comment(request, comment_id: int, payload: UpdateCommentSchema):
     """
     user = request.auth
 
-    try:
-        comment = OrderComment.objects.select_related('user', 'order').get(id=comment_id)
-    except OrderComment.DoesNotExist:
+    comment = _get_comment_for_write(comment_id)
+    if comment is None:
         return 404, {"detail": "Comment not found"}
 
     # Check permission
-    if comment.user != user:
+    if comment.user_id != user.id:
         return 403, {"detail": "You can only edit your own comments"}
 
     # Can't edit system messages
@@ -120,10 +128,10 @@ def update_comment(request, comment_id: int, payload: UpdateCommentSchema):
     comment.save(update_fields=['message', 'is_edited', 'updated_at'])
 
     # Broadcast update
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_updated(comment.order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_updated, comment.order_id, comment_schema.model_dump(mode='json'))
 
-    return 200, CommentSchema.from_orm(comment)
+    return 200, comment_schema
 
 
 @comments_router.delete("/comments/{comment_id}", response={204: None, 403: ErrorResponse, 404: ErrorResponse})
@@ -134,13 +142,12 @@ def delete_comment(request, comment_id: int):
     """
     user = request.auth
 
-    try:
-        comment = OrderComment.objects.select_related('user', 'order').get(id=comment_id)
-    except OrderComment.DoesNotExist:
+    comment = _get_comment_for_write(comment_id)
+    if comment is None:
         return 404, {"detail": "Comment not found"}
 
     # Check permission
-    if comment.user != user and not user.is_staff:
+    if comment.user_id != user.id and not user.is_staff:
         return 403, {"detail": "You can only delete your own comments"}
 
     # Can't delete system messages
@@ -154,7 +161,7 @@ def delete_comment(request, comment_id: int):
     comment.delete()
 
     # Broadcast deletion
-    broadcast_comment_deleted(order_id, comment_id_to_delete)
+    broadcast_after_commit(broadcast_comment_deleted, order_id, comment_id_to_delete)
 
     return 204, None
 
@@ -172,19 +179,17 @@ def create_system_comment(request, order_id: int, message: str):
     if not user.is_staff:
         return 403, {"detail": "Only staff can create system messages"}
 
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    if not Order.objects.filter(id=order_id).exists():
         return 404, {"detail": "Order not found"}
 
     comment = OrderComment.objects.create(
-        order=order,
+        order_id=order_id,
         message=message,
         is_system_message=True
     )
 
     # Broadcast
-    comment_data = CommentSchema.from_orm(comment).model_dump(mode='json')
-    broadcast_comment_created(order_id, comment_data)
+    comment_schema = CommentSchema.from_orm(comment)
+    broadcast_after_commit(broadcast_comment_created, order_id, comment_schema.model_dump(mode='json'))
 
-    return 201, CommentSchema.from_orm(comment)
+    return 201, comment_schema
@@ -1,7 +1,19 @@
 """Order API router."""
-from django.http import HttpResponse
+import logging
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse, FileResponse
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from ninja import Router, File, UploadedFile, Form, Query
+from ninja.responses import NinjaJSONEncoder
 
+from apps.orders.models import OrderImage, OrderActivity
 from apps.orders.schemas.input_schema import (
     CreateOrderSchema,
     UpdateOrderSchema,
@@ -14,39 +26,74 @@ from apps.orders.schemas.output_schema import (
     OrderOutSchema,
     OrderDetailSchema
 )
-from apps.orders.schemas.activity_schema import OrderActivitySchema
+from apps.orders.schemas.activity_schema import OrderActivitySchema, ACTIVITY_VALUE_FIELDS
 from apps.orders.services.service_a import OrderService
+from apps.orders.cache import invalidate_order_detail
+from apps.orders.socketio_client import (
+    broadcast_after_commit,
+    broadcast_order_image_deleted,
+    broadcast_order_deleted
+)
+from apps.orders.exports import (
+    EXPORT_FORMATS,
+    PDF_CONTENT_TYPE,
+    DOCX_CONTENT_TYPE,
+    load_item_rows,
+    render_order_pdf,
+    render_order_docx,
+    submit_export,
+    get_export
+)
 from core.responses.api_response import ApiResponse, ErrorResponse
 from core.utils.pagination import PaginatedResponse
-from core.authentication import JWTAuth
+from core.utils.storage import delete_file_after_commit
+from core.authentication import JWTAuth, AsyncJWTAuth
+from core.enums.base_enum import UserRole
+
+logger = logging.getLogger(__name__)
 
 orders_router = Router(auth=JWTAuth())
 order_service = OrderService()
 
+# get_user_permissions payload per role, the response only depends on user.role
+_ROLE_PERMISSIONS = {
+    role.value: {
+        "role": role.value,
+        "role_label": UserRole.get_label(role),
+        "allowed_statuses": [status.value for status in UserRole.get_allowed_statuses(role)],
+        "can_create_order": role in (UserRole.ADMIN, UserRole.MANAGER, UserRole.SALE),
+    }
+    for role in UserRole
+}
+# Allowed statuses per role as shown in the forbidden-transition message
+_ALLOWED_STATUSES_MSG = {
+    role.value: ', '.join(status.value for status in UserRole.get_allowed_statuses(role))
+    for role in UserRole
+}
+_UNKNOWN_ROLE_PERMISSIONS = {
+    "role": "unknown",
+    "role_label": "Unknown",
+    "allowed_statuses": [],
+    "can_create_order": False,
+}
+
+
+def _conditional_json(request, etag: str, data):
+    """
+    JsonResponse tagged with etag, or 304 Not Modified when the client's If-None-Match matches.
+    Encoded like ninja's renderer, so datetimes etc. match the other endpoints.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(data, safe=False, encoder=NinjaJSONEncoder)
+    response['ETag'] = etag
+    return response
+
 
 @orders_router.get("/permissions", response={200: dict})
 def get_user_permissions(request):
     """Get current user's permissions."""
-    try:
-        from core.enums.base_enum import UserRole
-
-        user = request.auth
-
-        allowed_statuses = UserRole.get_allowed_statuses(user.role)
-
-        return 200, {
-            "role": user.role,
-            "role_label": UserRole.get_label(UserRole(user.role)),
-            "allowed_statuses": [status.value for status in allowed_statuses],
-            "can_create_order": user.role in [UserRole.ADMIN.value, UserRole.MANAGER.value, UserRole.SALE.value],
-        }
-    except Exception as e:
-        return 200, {
-            "role": "unknown",
-            "role_label": "Unknown",
-            "allowed_statuses": [],
-            "can_create_order": False,
-        }
+    return 200, _ROLE_PERMISSIONS.get(request.auth.role, _UNKNOWN_ROLE_PERMISSIONS)
 
 
 @orders_router.post("/", response={201: OrderDetailSchema, 400: ErrorResponse})
@@ -83,10 +130,8 @@ def list_orders(
             page=filters.page,
             page_size=filters.page_size
         )
-    except Exception as e:
-        print(f"Error in list_orders: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("list_orders failed")
         return PaginatedResponse.create(
             items=[],
             total=0,
@@ -98,18 +143,18 @@ def list_orders(
 @orders_router.get("/{order_id}", response={200: OrderDetailSchema, 404: ErrorResponse})
 def get_order(request, order_id: int):
     """Get order by ID."""
-    order = order_service.get_order_by_id(order_id)
-    if not order:
+    order_detail = order_service.get_order_detail(order_id)
+    if order_detail is None:
         return 404, {"detail": f"Order with ID {order_id} not found"}
-    return 200, order
+    # Payload is already OrderDetailSchema output, skip re-validating it
+    etag, order_data = order_detail
+    return _conditional_json(request, etag, order_data)
 
 
 @orders_router.patch("/{order_id}", response={200: OrderDetailSchema, 400: ErrorResponse, 403: ErrorResponse})
 def update_order(request, order_id: int, payload: UpdateOrderSchema):
     """Update order details (items, customer info, fees, etc.)."""
     try:
-        from core.enums.base_enum import UserRole
-
         user = request.auth
 
         # Only admin, manager, and sale can edit orders
@@ -128,8 +173,6 @@ def update_order(request, order_id: int, payload: UpdateOrderSchema):
 def update_order_status(request, order_id: int, payload: UpdateOrderStatusSchema):
     """Update order status."""
     try:
-        from core.enums.base_enum import UserRole
-
         user = request.auth
 
         # Check permission before updating status
@@ -139,7 +182,12 @@ def update_order_status(request, order_id: int, payload: UpdateOrderStatusSchema
 
         # Check if user can transition from current status to new status
         if not UserRole.can_transition(user.role, order.status, payload.new_status):
-            return 403, {"detail": f"Bạn không có quyền chuyển đơn từ '{order.status}' sang '{payload.new_status}'. Vai trò của bạn chỉ được phép làm các giai đoạn: {', '.join(UserRole.get_allowed_statuses(user.role))}"}
+            return 403, {
+                "detail": (
+                    f"Bạn không có quyền chuyển đơn từ '{order.status}' sang '{payload.new_status}'. "
+                    f"Vai trò của bạn chỉ được phép làm các giai đoạn: {_ALLOWED_STATUSES_MSG.get(user.role, '')}"
+                )
+            }
 
         order = order_service.update_order_status(order_id, payload, user)
         return 200, order
@@ -182,8 +230,6 @@ def upload_order_image(
 def update_assigned_users(request, order_id: int, payload: UpdateAssignedUsersSchema):
     """Update assigned users for an order."""
     try:
-        from core.enums.base_enum import UserRole
-
         user = request.auth
 
         # Only admin and manager can reassign
@@ -215,12 +261,6 @@ def cleanup_old_images(request, days: int = 30, dry_run: bool = False):
     Only Admin can execute this.
     """
     try:
-        from core.enums.base_enum import UserRole
-        from apps.orders.models import OrderImage
-        from datetime import timedelta
-        from django.utils import timezone
-        import os
-
         user = request.auth
 
         # Only admin can cleanup
@@ -248,6 +288,7 @@ def cleanup_old_images(request, days: int = 30, dry_run: bool = False):
         deleted_count = 0
         failed_count = 0
         deleted_files = []
+        affected_order_ids = set()
 
         for image in old_images:
             try:
@@ -266,10 +307,12 @@ def cleanup_old_images(request, days: int = 30, dry_run: bool = False):
                         image.image.delete(save=False)
                         image.delete()
                         deleted_count += 1
+                        affected_order_ids.add(image.order_id)
                 else:
                     if not dry_run:
                         image.delete()
                         deleted_count += 1
+                        affected_order_ids.add(image.order_id)
 
                 deleted_files.append(file_info)
 
@@ -278,6 +321,8 @@ def cleanup_old_images(request, days: int = 30, dry_run: bool = False):
                 file_info["error"] = str(e)
                 deleted_files.append(file_info)
 
+        invalidate_order_detail(*affected_order_ids)
+
         total_size_mb = round(total_size / (1024 * 1024), 2)
 
         return 200, {
@@ -294,8 +339,7 @@ def cleanup_old_images(request, days: int = 30, dry_run: bool = False):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("cleanup_old_images failed")
         return 400, {"detail": f"Lỗi khi xóa ảnh: {str(e)}"}
 
 
@@ -306,12 +350,6 @@ def preview_cleanup_old_images(request, days: int = 30):
     Only Admin can access this.
     """
     try:
-        from core.enums.base_enum import UserRole
-        from apps.orders.models import OrderImage
-        from datetime import timedelta
-        from django.utils import timezone
-        import os
-
         user = request.auth
 
         # Only admin can preview
@@ -372,8 +410,7 @@ def preview_cleanup_old_images(request, days: int = 30):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("preview_cleanup_old_images failed")
         return 400, {"detail": f"Lỗi: {str(e)}"}
 
 
@@ -382,27 +419,25 @@ def preview_cleanup_old_images(request, days: int = 30):
 def delete_order_image(request, order_id: int, image_id: int):
     """Delete an order image."""
     try:
-        from apps.orders.models import OrderImage
-        from apps.orders.websocket_utils import broadcast_order_image_deleted
-        from apps.orders.schemas.output_schema import OrderDetailSchema
-
-        image = OrderImage.objects.filter(id=image_id, order_id=order_id).first()
+        image = order_service.get_order_image(order_id, image_id)
         if not image:
             return 404, {"detail": f"Image with ID {image_id} not found in order {order_id}"}
 
-        # Get order before deleting image
-        order = order_service.get_order_by_id(order_id)
-
-        # Delete the file from disk
-        if image.image:
-            image.image.delete(save=False)
+        file_name, file_storage = image.image.name, image.image.storage
 
         # Delete the database record
         image.delete()
 
-        # Broadcast image deleted event with full order
-        order_data = OrderDetailSchema.from_orm(order).model_dump(mode='json')
-        broadcast_order_image_deleted(order_id, image_id, order_data)
+        # Delete the file from storage in the background, after the row is gone
+        delete_file_after_commit(file_name, file_storage)
+
+        # Broadcast just the ids, clients drop the image locally instead of
+        # receiving a re-serialized order
+        remaining_image_ids = order_service.get_order_image_ids(order_id)
+        broadcast_after_commit(
+            broadcast_order_image_deleted, order_id, image_id, remaining_image_ids
+        )
+        invalidate_order_detail(order_id)
 
         return 204, None
     except Exception as e:
@@ -413,14 +448,21 @@ def delete_order_image(request, order_id: int, image_id: int):
 def get_order_activities(request, order_id: int):
     """Get activity log for an order."""
     try:
-        from apps.orders.models import OrderActivity
-
-        order = order_service.get_order_by_id(order_id)
-        if not order:
+        if not order_service.order_exists(order_id):
             return 404, {"detail": f"Order with ID {order_id} not found"}
 
-        activities = OrderActivity.objects.filter(order=order).select_related('user').order_by('-created_at')
-        return 200, list(activities)
+        activities = OrderActivity.objects.filter(order_id=order_id)
+
+        # Activities are append-only, so newest timestamp + count identify the list
+        latest = activities.aggregate(count=Count('id'), last=Max('created_at'))
+        etag = quote_etag(f"{order_id}-{latest['count']}-{latest['last'].timestamp() if latest['last'] else 0}")
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        rows = activities.values(*ACTIVITY_VALUE_FIELDS).order_by('-created_at')
+        # Dicts already have the OrderActivitySchema shape, skip re-validating them
+        return _conditional_json(request, etag, OrderActivitySchema.list_from_values(rows))
     except Exception as e:
         return 400, {"detail": str(e)}
 
@@ -429,8 +471,6 @@ def get_order_activities(request, order_id: int):
 def delete_order(request, order_id: int):
     """Delete an order."""
     try:
-        from apps.orders.websocket_utils import broadcast_order_deleted
-
         order = order_service.get_order_by_id(order_id)
         if not order:
             return 404, {"detail": f"Order with ID {order_id} not found"}
@@ -438,214 +478,95 @@ def delete_order(request, order_id: int):
         order.delete()
 
         # Broadcast order deleted event
-        broadcast_order_deleted(order_id)
+        broadcast_after_commit(broadcast_order_deleted, order_id)
+        invalidate_order_detail(order_id)
 
         return 204, None
     except Exception as e:
         return 400, {"detail": str(e)}
 
 
-@orders_router.get("/{order_id}/export-pdf", url_name="export_pdf")
-def export_order_pdf(request, order_id: int, type: str = "order_bill", size: str = "K80"):
-    """Export order as PDF."""
-    from reportlab.lib.pagesizes import A4, A5
-    from reportlab.lib.units import mm
-    from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from io import BytesIO
-    import os
-    from django.conf import settings
+async def _load_export(order_id: int):
+    """Order and item rows for an export, queried off the event loop. (None, None) if missing."""
+    def load():
+        order = order_service.get_order_for_export(order_id)
+        return (order, load_item_rows(order)) if order else (None, None)
+    return await sync_to_async(load)()
 
+
+@orders_router.get("/{order_id}/export-pdf", url_name="export_pdf", auth=AsyncJWTAuth())
+async def export_order_pdf(request, order_id: int, type: str = "order_bill", size: str = "K80"):
+    """Export order as PDF."""
     try:
-        order = order_service.get_order_by_id(order_id)
+        order, items = await _load_export(order_id)
         if not order:
             return HttpResponse("Order not found", status=404)
 
-        # Create PDF
-        buffer = BytesIO()
-
-        # Set page size
-        if size == "A4":
-            pagesize = A4
-        elif size == "A5":
-            pagesize = A5
-        elif size == "K80":
-            pagesize = (80*mm, 297*mm)
-        else:  # K57
-            pagesize = (57*mm, 297*mm)
-
-        p = canvas.Canvas(buffer, pagesize=pagesize)
-        width, height = pagesize
-
-        # Use Helvetica (built-in font)
-        p.setFont('Helvetica', 10)
-
-        # Draw content
-        y_position = height - 40
-
-        # Header
-        p.setFont('Helvetica-Bold', 14)
-        title = {
-            'order_bill': 'PHIEU DAT HANG',
-            'weighing_receipt': 'PHIEU CAN HANG',
-            'payment_bill': 'HOA DON THANH TOAN',
-            'delivery_note': 'PHIEU GIAO HANG'
-        }.get(type, 'HOA DON')
-
-        p.drawCentredString(width/2, y_position, title)
-        y_position -= 30
-
-        # Order info
-        p.setFont('Helvetica', 10)
-        p.drawString(20, y_position, f"Ma don: {order.order_number}")
-        y_position -= 20
-        p.drawString(20, y_position, f"Khach hang: {order.customer.name}")
-        y_position -= 20
-        p.drawString(20, y_position, f"SDT: {order.customer.phone}")
-        y_position -= 20
-        p.drawString(20, y_position, f"Dia chi: {order.customer.address}")
-        y_position -= 30
-
-        # Items
-        p.setFont('Helvetica-Bold', 10)
-        p.drawString(20, y_position, "San pham:")
-        y_position -= 20
-
-        p.setFont('Helvetica', 9)
-        for item in order.items.all():
-            item_text = f"{item.product.name} - {item.quantity} {item.unit} x {item.price:,.0f}d = {item.total_price:,.0f}d"
-            p.drawString(30, y_position, item_text)
-            y_position -= 15
-
-        y_position -= 10
-
-        # Totals
-        p.setFont('Helvetica', 10)
-        p.drawString(20, y_position, f"Tam tinh: {order.subtotal:,.0f}d")
-        y_position -= 15
-        p.drawString(20, y_position, f"Phi van chuyen: {order.shipping_fee:,.0f}d")
-        y_position -= 15
-        p.drawString(20, y_position, f"Phi chip: {order.chip_fee:,.0f}d")
-        y_position -= 20
-
-        p.setFont('Helvetica-Bold', 12)
-        p.drawString(20, y_position, f"Tong cong: {order.total:,.0f}d")
-
-        p.showPage()
-        p.save()
-
-        buffer.seek(0)
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{order.order_number}_{type}.pdf"'
-        return response
+        # Rendering is pure CPU work, run it on the thread pool so the event loop stays free
+        buffer = await sync_to_async(render_order_pdf, thread_sensitive=False)(order, items, type, size)
+        # Stream the buffer instead of copying it into a bytes object first
+        return FileResponse(
+            buffer,
+            as_attachment=True,
+            filename=f"{order.order_number}_{type}.pdf",
+            content_type=PDF_CONTENT_TYPE
+        )
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("export_order_pdf failed")
         return HttpResponse(f"Error: {str(e)}", status=500)
 
 
-@orders_router.get("/{order_id}/export-word", url_name="export_word")
-def export_order_word(request, order_id: int, type: str = "order_bill", size: str = "A4"):
+@orders_router.get("/{order_id}/export-word", url_name="export_word", auth=AsyncJWTAuth())
+async def export_order_word(request, order_id: int, type: str = "order_bill", size: str = "A4"):
     """Export order as Word document."""
-    from docx import Document
-    from docx.shared import Inches
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from io import BytesIO
-
     try:
-        order = order_service.get_order_by_id(order_id)
+        order, items = await _load_export(order_id)
         if not order:
             return HttpResponse("Order not found", status=404)
 
-        # Create Word document
-        doc = Document()
-
-        # Set page margins for size
-        sections = doc.sections
-        for section in sections:
-            if size == "A5":
-                section.page_height = Inches(8.27)
-                section.page_width = Inches(5.83)
-            # A4 is default
-            section.top_margin = Inches(0.5)
-            section.bottom_margin = Inches(0.5)
-            section.left_margin = Inches(0.5)
-            section.right_margin = Inches(0.5)
-
-        # Title
-        title = {
-            'order_bill': 'PHIẾU ĐẶT HÀNG',
-            'weighing_receipt': 'PHIẾU CÂN HÀNG',
-            'payment_bill': 'HÓA ĐƠN THANH TOÁN',
-            'delivery_note': 'PHIẾU GIAO HÀNG'
-        }.get(type, 'HÓA ĐƠN')
-
-        heading = doc.add_heading(title, 0)
-        heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        # Order info
-        doc.add_paragraph(f"Mã đơn: {order.order_number}")
-        doc.add_paragraph(f"Khách hàng: {order.customer.name}")
-        doc.add_paragraph(f"Số điện thoại: {order.customer.phone}")
-        doc.add_paragraph(f"Địa chỉ: {order.customer.address}")
-
-        if order.delivery_time:
-            doc.add_paragraph(f"Thời gian giao: {order.delivery_time.strftime('%d/%m/%Y %H:%M')}")
-
-        # Items table
-        doc.add_paragraph()
-        doc.add_heading('Sản phẩm:', level=2)
-
-        table = doc.add_table(rows=1, cols=5)
-        table.style = 'Light Grid Accent 1'
-
-        # Header row
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = 'STT'
-        hdr_cells[1].text = 'Sản phẩm'
-        hdr_cells[2].text = 'Số lượng'
-        hdr_cells[3].text = 'Đơn giá'
-        hdr_cells[4].text = 'Thành tiền'
-
-        # Data rows
-        for idx, item in enumerate(order.items.all(), 1):
-            row_cells = table.add_row().cells
-            row_cells[0].text = str(idx)
-            row_cells[1].text = item.product.name
-            row_cells[2].text = f"{item.quantity} {item.unit}"
-            row_cells[3].text = f"{item.price:,.0f}đ"
-            row_cells[4].text = f"{item.total_price:,.0f}đ"
-
-        # Totals
-        doc.add_paragraph()
-        doc.add_paragraph(f"Tạm tính: {order.subtotal:,.0f}đ")
-        doc.add_paragraph(f"Phí vận chuyển: {order.shipping_fee:,.0f}đ")
-        doc.add_paragraph(f"Phí chip: {order.chip_fee:,.0f}đ")
-
-        total_para = doc.add_paragraph()
-        total_para.add_run(f"Tổng cộng: {order.total:,.0f}đ").bold = True
-
-        # Notes
-        if order.notes:
-            doc.add_paragraph()
-            doc.add_heading('Ghi chú:', level=2)
-            doc.add_paragraph(order.notes)
-
-        # Save to buffer
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer.read(),
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        buffer = await sync_to_async(render_order_docx, thread_sensitive=False)(order, items, type, size)
+        return FileResponse(
+            buffer,
+            as_attachment=True,
+            filename=f"{order.order_number}_{type}.docx",
+            content_type=DOCX_CONTENT_TYPE
         )
-        response['Content-Disposition'] = f'attachment; filename="{order.order_number}_{type}.docx"'
-        return response
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("export_order_word failed")
         return HttpResponse(f"Error: {str(e)}", status=500)
+
+
+@orders_router.post("/{order_id}/exports", response={202: dict, 400: ErrorResponse, 404: ErrorResponse})
+def create_order_export(request, order_id: int, format: str = "pdf", type: str = "order_bill", size: str = "K80"):
+    """
+    Queue a PDF/Word export rendered off the request thread.
+    Poll GET /exports/{job_id} to download the file.
+    """
+    if format not in EXPORT_FORMATS:
+        return 400, {"detail": f"Unsupported export format '{format}'"}
+    if not order_service.order_exists(order_id):
+        return 404, {"detail": f"Order with ID {order_id} not found"}
+
+    job_id = submit_export(order_id, format, type, size)
+    return 202, {"job_id": job_id, "status": "pending"}
+
+
+@orders_router.get("/exports/{job_id}", response={202: dict, 404: ErrorResponse, 500: ErrorResponse})
+def get_order_export(request, job_id: str):
+    """Download a queued export, 202 while it is still rendering."""
+    job = get_export(job_id)
+    if job is None:
+        return 404, {"detail": "Export not found or expired"}
+    if job['status'] == 'pending':
+        return 202, {"job_id": job_id, "status": "pending"}
+    if job['status'] == 'failed':
+        return 500, {"detail": job['detail']}
+
+    return FileResponse(
+        BytesIO(job['content']),
+        as_attachment=True,
+        filename=job['filename'],
+        content_type=job['content_type']
+    )
@@ -13,6 +13,7 @@ from core.permissions import (
     require_permission,
     require_any_permission,
     require_all_permissions,
+    has,
     shield
 )
 
@@ -67,10 +68,8 @@ def delete_order(request, order_id: int):
 
     Uses manual permission check for additional logic.
     """
-    user = request.auth
-
     # Manual check for soft vs hard delete
-    can_hard_delete = shield.can(user, 'order:hard_delete')
+    can_hard_delete = has(request, 'order:hard_delete')
 
     if can_hard_delete:
         # Permanently delete
@@ -92,16 +91,22 @@ def get_my_permissions(request):
     user = request.auth
     permissions = shield.get_user_permissions(user)
 
+    # One batch check against the same (memoized) permission mask
+    granted = shield.filter_granted(user, (
+        'order:create', 'order:update', 'order:delete',
+        'order:change_status', 'order:view_all',
+    ))
+
     return {
         "username": user.username,
         "role": user.role,
         "permissions": permissions,
         "can": {
-            "create_order": shield.can(user, 'order:create'),
-            "update_order": shield.can(user, 'order:update'),
-            "delete_order": shield.can(user, 'order:delete'),
-            "change_status": shield.can(user, 'order:change_status'),
-            "view_all_orders": shield.can(user, 'order:view_all'),
+            "create_order": 'order:create' in granted,
+            "update_order": 'order:update' in granted,
+            "delete_order": 'order:delete' in granted,
+            "change_status": 'order:change_status' in granted,
+            "view_all_orders": 'order:view_all' in granted,
         }
     }
 
@@ -118,7 +123,7 @@ def list_orders(request, assigned_to_me: bool = False):
     user = request.auth
 
     # Check if user can view all orders
-    if shield.can(user, 'order:view_all'):
+    if has(request, 'order:view_all'):
         # Return all orders
         orders = order_service.get_all_orders()
     else:
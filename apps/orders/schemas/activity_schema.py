@@ -3,6 +3,12 @@ from ninja import Schema
 from datetime import datetime
 from typing import Optional
 
+# .values() keys consumed by OrderActivitySchema.list_from_values()
+ACTIVITY_VALUE_FIELDS = (
+    'id', 'activity_type', 'description', 'old_value', 'new_value', 'metadata', 'created_at',
+    'user_id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+)
+
 
 class UserInfoSchema(Schema):
     """User info in activity."""
@@ -34,3 +40,33 @@ class OrderActivitySchema(Schema):
                 'email': obj.user.email
             }
         return None
+
+    @staticmethod
+    def list_from_values(rows) -> list[dict]:
+        """
+        Build response dicts straight from .values(*ACTIVITY_VALUE_FIELDS) rows.
+        Read-only fast path for listing: no model instances, no resolvers.
+        """
+        activities = []
+        for row in rows:
+            user = None
+            if row['user_id']:
+                full_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+                user = {
+                    'id': row['user_id'],
+                    'username': row['user__username'],
+                    'full_name': full_name or row['user__username'],
+                    'email': row['user__email']
+                }
+
+            activities.append({
+                'id': row['id'],
+                'activity_type': row['activity_type'],
+                'description': row['description'],
+                'old_value': row['old_value'],
+                'new_value': row['new_value'],
+                'metadata': row['metadata'],
+                'user': user,
+                'created_at': row['created_at']
+            })
+        return activities
@@ -4,6 +4,18 @@ Schemas for Order Comments/Chat API.
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+# Prefix for absolute comment image URLs, read once instead of per comment
+_BASE_URL = getattr(settings, 'BASE_URL', 'http://localhost:8000')
+
+
+def _absolute_image_url(url: str) -> str:
+    """Prefix a storage URL with _BASE_URL, encoding Vietnamese characters and special chars."""
+    return f"{_BASE_URL}{quote(url, safe='/:?=&')}"
 
 
 # ==================== Input Schemas ====================
@@ -27,6 +39,21 @@ class UpdateCommentSchema(BaseModel):
 
 # ==================== Output Schemas ====================
 
+# Columns needed to render comments from .values() rows (see CommentSchema.list_from_values)
+COMMENT_VALUE_FIELDS = (
+    'id', 'order_id', 'message', 'image', 'created_at', 'updated_at',
+    'is_edited', 'is_system_message',
+    'user_id', 'user__first_name', 'user__last_name', 'user__email',
+)
+
+# .only() fields for loading a single comment (with its user) to build a CommentSchema
+COMMENT_MODEL_FIELDS = (
+    'id', 'order_id', 'message', 'image', 'created_at', 'updated_at',
+    'is_edited', 'is_system_message',
+    'user__id', 'user__first_name', 'user__last_name', 'user__email',
+)
+
+
 class CommentUserSchema(BaseModel):
     """User info in comment."""
     id: int
@@ -62,22 +89,14 @@ class CommentSchema(BaseModel):
     @classmethod
     def from_orm(cls, comment):
         """Convert ORM model to schema."""
-        from django.conf import settings
-        from urllib.parse import quote
-
         # Build full image URL if image exists
-        image_url = None
-        if comment.image:
-            # Get base URL from settings or use default
-            base_url = getattr(settings, 'BASE_URL', 'http://localhost:8000')
-            # Properly encode URL for Vietnamese characters and special chars
-            encoded_url = quote(comment.image.url, safe='/:?=&')
-            image_url = f"{base_url}{encoded_url}"
+        image_url = _absolute_image_url(comment.image.url) if comment.image else None
 
+        user = comment.user
         return cls(
             id=comment.id,
             order_id=comment.order_id,
-            user=CommentUserSchema.from_orm(comment.user) if comment.user else None,
+            user=CommentUserSchema.model_validate(user) if user else None,
             user_name=comment.user_name,
             message=comment.message,
             image=image_url,
@@ -88,6 +107,44 @@ class CommentSchema(BaseModel):
             is_system_message=comment.is_system_message
         )
 
+    @staticmethod
+    def list_from_values(rows) -> list[dict]:
+        """
+        Build response dicts straight from .values(*COMMENT_VALUE_FIELDS) rows.
+        Read-only fast path for listing: no model instances, no per-row from_orm.
+        """
+        comments = []
+        for row in rows:
+            image_url = None
+            if row['image']:
+                image_url = _absolute_image_url(default_storage.url(row['image']))
+
+            user = None
+            user_name = "System"
+            if row['user_id'] is not None:
+                user = {
+                    'id': row['user_id'],
+                    'first_name': row['user__first_name'],
+                    'last_name': row['user__last_name'],
+                    'email': row['user__email'],
+                }
+                user_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+
+            comments.append({
+                'id': row['id'],
+                'order_id': row['order_id'],
+                'user': user,
+                'user_name': user_name,
+                'message': row['message'],
+                'image': image_url,
+                'has_image': bool(row['image']),
+                'created_at': row['created_at'],
+                'updated_at': row['updated_at'],
+                'is_edited': row['is_edited'],
+                'is_system_message': row['is_system_message'],
+            })
+        return comments
+
 
 class CommentListResponse(BaseModel):
     """Response for list of comments."""
@@ -1,7 +1,8 @@
 """Input schemas for orders."""
 from typing import List, Optional, Union
-from datetime import datetime
+from datetime import datetime, time
 from decimal import Decimal
+from django.utils import timezone
 from pydantic import BaseModel, Field, validator
 from ninja import Schema
 
@@ -144,6 +145,22 @@ class OrderFilterSchema(Schema):
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
 
+    @validator('date_from')
+    def normalize_date_from(cls, v):
+        """Naive dates start at 00:00 local time."""
+        if v is not None and v.tzinfo is None:
+            return timezone.make_aware(datetime.combine(v.date(), time.min))
+        return v
+
+    @validator('date_to')
+    def normalize_date_to(cls, v):
+        """Include the entire day (up to 23:59:59.999999)."""
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return timezone.make_aware(datetime.combine(v.date(), time.max))
+        return v.replace(hour=23, minute=59, second=59, microsecond=999999)
+
     class Config:
         """Pydantic config."""
         # Allow None for all optional fields
@@ -5,12 +5,14 @@ from django.utils import timezone
 from django.db import transaction
 
 from apps.orders.models import Order, OrderItem, OrderActivity
+from apps.orders.cache import get_cached_order_detail, cache_order_detail, invalidate_order_detail
 from apps.orders.repositories.repository_a import OrderRepository
 from apps.orders.schemas.input_schema import CreateOrderSchema, UpdateOrderStatusSchema, OrderFilterSchema
 from apps.products.models import Product
 from apps.users.models import User
 from core.enums.base_enum import OrderStatus
 from apps.orders.socketio_client import (
+    broadcast_after_commit,
     broadcast_order_created,
     broadcast_order_updated,
     broadcast_order_deleted,
@@ -67,6 +69,35 @@ class OrderService:
         """Get order by ID."""
         return self.repository.get_order_by_id(order_id)
 
+    def get_order_detail(self, order_id: int) -> Optional[Tuple[str, dict]]:
+        """Get (etag, serialized OrderDetailSchema payload), served from cache when possible."""
+        cached = get_cached_order_detail(order_id)
+        if cached is None:
+            order = self.get_order_by_id(order_id)
+            if not order:
+                return None
+
+            from apps.orders.schemas.output_schema import OrderDetailSchema
+            payload = OrderDetailSchema.from_orm(order).model_dump()
+            cached = cache_order_detail(order_id, payload), payload
+        return cached
+
+    def get_order_for_export(self, order_id: int) -> Optional[Order]:
+        """Get order for PDF/Word exports."""
+        return self.repository.get_order_for_export(order_id)
+
+    def get_order_image(self, order_id: int, image_id: int):
+        """Get an image belonging to an order."""
+        return self.repository.get_order_image(order_id, image_id)
+
+    def get_order_image_ids(self, order_id: int) -> List[int]:
+        """Get IDs of all images of an order."""
+        return self.repository.get_order_image_ids(order_id)
+
+    def order_exists(self, order_id: int) -> bool:
+        """Check whether an order exists."""
+        return self.repository.order_exists(order_id)
+
     @transaction.atomic
     def create_order(
         self,
@@ -149,7 +180,7 @@ class OrderService:
         # Broadcast order created event
         from apps.orders.schemas.output_schema import OrderDetailSchema
         order_data = OrderDetailSchema.from_orm(order).model_dump(mode='json')
-        broadcast_order_created(order_data)
+        broadcast_after_commit(broadcast_order_created, order_data)
 
         return order
 
@@ -234,7 +265,8 @@ class OrderService:
         # Broadcast order updated event
         from apps.orders.schemas.output_schema import OrderDetailSchema
         order_data_dict = OrderDetailSchema.from_orm(order).model_dump(mode='json')
-        broadcast_order_updated(order_data_dict)
+        broadcast_after_commit(broadcast_order_updated, order_data_dict)
+        invalidate_order_detail(order.id)
 
         return order
 
@@ -284,7 +316,8 @@ class OrderService:
         # Broadcast order status changed event
         from apps.orders.schemas.output_schema import OrderDetailSchema
         order_data = OrderDetailSchema.from_orm(order).model_dump(mode='json')
-        broadcast_order_status_changed(order.id, old_status, status_data.new_status, order_data)
+        broadcast_after_commit(broadcast_order_status_changed, order.id, old_status, status_data.new_status, order_data)
+        invalidate_order_detail(order.id)
 
         return order
 
@@ -424,7 +457,8 @@ class OrderService:
         from apps.orders.schemas.output_schema import OrderDetailSchema
         order_data = OrderDetailSchema.from_orm(order).model_dump(mode='json')
         assigned_users_data = [{'id': u.id, 'name': u.get_full_name()} for u in users]
-        broadcast_order_assigned(order.id, assigned_users_data, order_data)
+        broadcast_after_commit(broadcast_order_assigned, order.id, assigned_users_data, order_data)
+        invalidate_order_detail(order.id)
 
         return order
 
@@ -483,7 +517,8 @@ class OrderService:
             'image_type': image.image_type,
             'uploaded_by': user.get_full_name()
         }
-        broadcast_order_image_uploaded(order.id, image_data, order_data)
+        broadcast_after_commit(broadcast_order_image_uploaded, order.id, image_data, order_data)
+        invalidate_order_detail(order.id)
 
         return image
 
@@ -2,10 +2,22 @@
 Socket.IO client for Django to broadcast events.
 Replaces Django Channels with HTTP calls to Socket.IO server.
 """
+import orjson
 import requests
 import logging
-from typing import Dict, Any, Optional
+import socket
+import threading
+import time
+import weakref
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
 from django.conf import settings
+from django.db import connection, transaction
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +28,209 @@ SOCKETIO_SERVER_URL = getattr(
     'http://localhost:4000'
 )
 
+# Unix domain socket of a Socket.IO server on the same host. When set, HTTP
+# requests go over this socket instead of TCP loopback; SOCKETIO_SERVER_URL
+# then only supplies the Host header and paths. Plain http:// URLs only, an
+# https:// server is always reached over TCP.
+SOCKETIO_SERVER_SOCKET = getattr(settings, 'SOCKETIO_SERVER_SOCKET', '')
+
+# Socket.IO server routes, resolved to full URLs once instead of per broadcast
+_ENDPOINTS = {
+    path: f"{SOCKETIO_SERVER_URL}{path}"
+    for path in (
+        '/broadcast/batch',
+        '/broadcast/order-created',
+        '/broadcast/order-updated',
+        '/broadcast/order-deleted',
+        '/broadcast/order-status-changed',
+        '/broadcast/order-image-uploaded',
+        '/broadcast/order-image-deleted',
+        '/broadcast/order-assigned',
+        '/broadcast/comment-created',
+        '/broadcast/comment-updated',
+        '/broadcast/comment-deleted',
+    )
+}
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Run broadcasts inline instead of on the pool (debugging / deterministic tests)
+BROADCAST_SYNC = getattr(settings, 'SOCKETIO_BROADCAST_SYNC', False)
+
+# Coalesce the broadcasts of one transaction into a single /broadcast/batch POST.
+# Needs the batch route on the Socket.IO server, hence opt-in.
+BATCH_BROADCASTS = getattr(settings, 'SOCKETIO_BATCH_BROADCASTS', False)
+BATCH_ENDPOINT = '/broadcast/batch'
+
+# Extra attempts for a broadcast that couldn't reach the Socket.IO server, with
+# backoff. Only connect failures are retried: once a POST was sent the server
+# may already have emitted the event, so resending it could duplicate it.
+BROADCAST_RETRIES = 3
+BROADCAST_RETRY_BACKOFF = 0.2  # seconds, doubled per attempt
+
+# Concurrent broadcasts; also the number of keep-alive connections kept open
+BROADCAST_WORKERS = 8
+
+# Broadcasts queued or running on the workers at most; beyond that (Socket.IO
+# server stalled) new ones are dropped instead of piling up in memory
+BROADCAST_QUEUE_SIZE = 1000
+
+
+class _UnixSocketConnection(HTTPConnection):
+    """HTTP connection to the Socket.IO server over SOCKETIO_SERVER_SOCKET."""
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(SOCKETIO_SERVER_SOCKET)
+        except OSError as e:
+            sock.close()
+            # Same errors as urllib3's own connections, so connect failures are
+            # told apart from failures after the request was sent
+            if isinstance(e, socket.timeout):
+                raise ConnectTimeoutError(self, f"Connection to {SOCKETIO_SERVER_SOCKET} timed out") from e
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+        return sock
+
+
+class _UnixSocketConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixSocketConnection
+
+
+class _UnixSocketAdapter(HTTPAdapter):
+    """Transport adapter routing http:// requests through the Unix socket."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _UnixSocketConnectionPool}
+
+
+# Shared session: keep-alive connections to the Socket.IO server are reused
+# across broadcasts instead of opening a new TCP connection per event.
+# One host, and never more connections than workers that could use them.
+_SESSION = requests.Session()
+for _scheme in ('http://', 'https://'):
+    # No TLS over the socket, so it only carries http://
+    adapter_cls = _UnixSocketAdapter if SOCKETIO_SERVER_SOCKET and _scheme == 'http://' else HTTPAdapter
+    # Retry only covers failed connects, a POST is never replayed once sent
+    _SESSION.mount(_scheme, adapter_cls(
+        pool_connections=1,
+        pool_maxsize=BROADCAST_WORKERS,
+        max_retries=Retry(total=1, backoff_factor=0.05)
+    ))
+
+# Background workers for broadcasts so the HTTP call stays off the request thread
+_broadcast_executor = ThreadPoolExecutor(
+    max_workers=BROADCAST_WORKERS,
+    thread_name_prefix='socketio-broadcast'
+)
+_broadcast_slots = threading.BoundedSemaphore(BROADCAST_QUEUE_SIZE)
+
+# Per thread: the batches pending commit, by savepoint level (batches), the
+# events of the batch being sent, which _post_to_socketio collects (events),
+# and whether the last failed POST never reached the server (connect_failed)
+_local = threading.local()
+
+
+def _submit_broadcast(func: Callable, *args) -> None:
+    """Run func on the broadcast workers, unless BROADCAST_QUEUE_SIZE are already pending."""
+    if not _broadcast_slots.acquire(blocking=False):
+        logger.error(f"❌ Broadcast queue full, dropping {getattr(func, '__name__', func)}")
+        return
+
+    future = _broadcast_executor.submit(func, *args)
+    future.add_done_callback(lambda _future: _broadcast_slots.release())
+
+
+def _run_broadcast(broadcast: Callable[..., bool], *args) -> bool:
+    """
+    Call a broadcast_* function, retrying with backoff while it fails to
+    connect to the Socket.IO server. Any other failure is final.
+    """
+    for attempt in range(BROADCAST_RETRIES + 1):
+        _local.connect_failed = False
+        if broadcast(*args):
+            return True
+        if not _local.connect_failed:
+            return False
+        if attempt < BROADCAST_RETRIES:
+            time.sleep(BROADCAST_RETRY_BACKOFF * (2 ** attempt))
+
+    logger.error(f"❌ Giving up on {broadcast.__name__} after {BROADCAST_RETRIES + 1} attempts")
+    return False
+
+
+class _BroadcastBatch:
+    """on_commit callback carrying every broadcast queued in one transaction."""
+
+    def __init__(self, savepoint_ids: tuple):
+        self.savepoint_ids = savepoint_ids
+        self.calls = []
+
+    def __call__(self):
+        # Committed: later broadcasts at this level belong to a new transaction
+        _local.batches.pop(self.savepoint_ids, None)
+        if BROADCAST_SYNC:
+            self.send()
+        else:
+            _submit_broadcast(self.send)
+
+    def send(self) -> bool:
+        # Build every payload through the regular broadcast_* functions
+        _local.events = events = []
+        try:
+            for broadcast, args in self.calls:
+                broadcast(*args)
+        finally:
+            del _local.events
+
+        if len(events) == 1:
+            event = events[0]
+            return _run_broadcast(_post_to_socketio, f"/broadcast/{event['event']}", event['payload'])
+        return _run_broadcast(_post_to_socketio, BATCH_ENDPOINT, {'events': events})
+
+
+def _pending_batch() -> _BroadcastBatch:
+    """
+    Return the batch registered for the current transaction, registering one
+    if needed. Only a batch queued at the current savepoint level is reused,
+    so a rolled back savepoint (or transaction) discards its events with it.
+
+    Batches are held by weak reference: the on_commit queue holds the only
+    strong one, so a batch dropped by a rollback disappears from here too.
+    """
+    batches = getattr(_local, 'batches', None)
+    if batches is None:
+        batches = _local.batches = weakref.WeakValueDictionary()
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    batch = batches.get(savepoint_ids)
+    if batch is None:
+        batch = batches[savepoint_ids] = _BroadcastBatch(savepoint_ids)
+        transaction.on_commit(batch)
+    return batch
+
+
+def broadcast_after_commit(broadcast: Callable[..., bool], *args) -> None:
+    """
+    Run a broadcast_* function in the background once the current
+    transaction commits (immediately when not inside an atomic block).
+    Failed broadcasts are retried, see BROADCAST_RETRIES. With
+    BATCH_BROADCASTS, all broadcasts of a transaction go out as one batch.
+
+    Args:
+        broadcast: One of the broadcast_* functions in this module
+        *args: Arguments passed to the broadcast function
+    """
+    if BATCH_BROADCASTS and connection.in_atomic_block:
+        _pending_batch().calls.append((broadcast, args))
+    elif BROADCAST_SYNC:
+        transaction.on_commit(lambda: _run_broadcast(broadcast, *args))
+    else:
+        transaction.on_commit(lambda: _submit_broadcast(_run_broadcast, broadcast, *args))
+
 
 def _post_to_socketio(endpoint: str, data: Dict[str, Any]) -> bool:
     """
@@ -28,12 +243,18 @@ def _post_to_socketio(endpoint: str, data: Dict[str, Any]) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    url = f"{SOCKETIO_SERVER_URL}{endpoint}"
+    events = getattr(_local, 'events', None)
+    if events is not None:
+        events.append({'event': endpoint.rsplit('/', 1)[-1], 'payload': data})
+        return True
+
+    url = _ENDPOINTS.get(endpoint) or f"{SOCKETIO_SERVER_URL}{endpoint}"
 
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url,
-            json=data,
+            data=orjson.dumps(data),
+            headers=_JSON_HEADERS,
             timeout=2  # 2 second timeout
         )
         response.raise_for_status()
@@ -46,6 +267,10 @@ def _post_to_socketio(endpoint: str, data: Dict[str, Any]) -> bool:
         return True
 
     except requests.exceptions.RequestException as e:
+        # requests wraps urllib3's connect errors (NewConnectionError is one) in
+        # ConnectionError; anything else may have reached the server
+        reason = getattr(e.args[0], 'reason', None) if e.args else None
+        _local.connect_failed = isinstance(reason, ConnectTimeoutError)
         logger.error(
             f"❌ Failed to broadcast to Socket.IO: {endpoint} - {e}"
         )
@@ -177,7 +402,7 @@ def broadcast_order_image_uploaded(
 def broadcast_order_image_deleted(
     order_id: int,
     image_id: int,
-    order_data: Optional[Dict[str, Any]] = None
+    remaining_image_ids: Optional[List[int]] = None
 ) -> bool:
     """
     Broadcast order_image_deleted event to all connected clients.
@@ -185,7 +410,7 @@ def broadcast_order_image_deleted(
     Args:
         order_id: Order ID
         image_id: Image ID that was deleted
-        order_data: Optional full order data for realtime update
+        remaining_image_ids: Optional IDs of the images the order still has
 
     Returns:
         bool: True if successful
@@ -197,8 +422,8 @@ def broadcast_order_image_deleted(
         'image_id': str(image_id)
     }
 
-    if order_data:
-        payload['order'] = order_data
+    if remaining_image_ids is not None:
+        payload['remaining_image_ids'] = remaining_image_ids
 
     return _post_to_socketio('/broadcast/order-image-deleted', payload)
 
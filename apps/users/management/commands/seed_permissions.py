@@ -8,17 +8,19 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from apps.users.models import Permission, RolePermission
 from core.enums import UserRole
+from core.permissions.shield import shield
 
 
 class Command(BaseCommand):
     help = 'Seed initial permissions and role-permission mappings'
 
     def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS('🌱 Seeding permissions...'))
+        # Output is collected and written once at the end
+        lines = [self.style.SUCCESS('🌱 Seeding permissions...')]
 
         with transaction.atomic():
             # Clear existing permissions
-            self.stdout.write('Clearing existing permissions...')
+            lines.append('Clearing existing permissions...')
             RolePermission.objects.all().delete()
             Permission.objects.all().delete()
 
@@ -61,12 +63,13 @@ class Command(BaseCommand):
             ]
 
             # Create permissions
-            self.stdout.write('Creating permissions...')
-            permissions = {}
-            for perm_data in permissions_data:
-                perm = Permission.objects.create(**perm_data)
-                permissions[perm.name] = perm
-                self.stdout.write(f'  ✓ {perm.name}')
+            lines.append('Creating permissions...')
+            # name is generated by the database; key by the same resource:action
+            perm_objs = Permission.objects.bulk_create([
+                Permission(**perm_data) for perm_data in permissions_data
+            ])
+            permissions = {f'{perm.resource}:{perm.action}': perm for perm in perm_objs}
+            lines.extend(f'  ✓ {name}' for name in permissions)
 
             # Define role-permission mappings
             role_permissions = {
@@ -115,17 +118,23 @@ class Command(BaseCommand):
             }
 
             # Create role-permission mappings
-            self.stdout.write('\nCreating role-permission mappings...')
+            rp_objs = [
+                RolePermission(role=role, permission=permissions[perm_name])
+                for role, perm_names in role_permissions.items()
+                for perm_name in perm_names
+                if perm_name in permissions
+            ]
+            RolePermission.objects.bulk_create(rp_objs, batch_size=500)
+
+            lines.append('\nCreating role-permission mappings...')
             for role, perm_names in role_permissions.items():
-                self.stdout.write(f'\n{role.upper()}:')
-                for perm_name in perm_names:
-                    if perm_name in permissions:
-                        RolePermission.objects.create(
-                            role=role,
-                            permission=permissions[perm_name]
-                        )
-                        self.stdout.write(f'  ✓ {perm_name}')
-
-            self.stdout.write(self.style.SUCCESS('\n✅ Permissions seeded successfully!'))
-            self.stdout.write(self.style.SUCCESS(f'   Created {len(permissions)} permissions'))
-            self.stdout.write(self.style.SUCCESS(f'   Created {RolePermission.objects.count()} role mappings'))
+                lines.append(f'\n{role.upper()}:')
+                lines.extend(f'  ✓ {perm_name}' for perm_name in perm_names if perm_name in permissions)
+
+            # bulk_create doesn't send post_save, drop the cached role mapping here
+            transaction.on_commit(shield.clear_cache)
+
+        lines.append(self.style.SUCCESS('\n✅ Permissions seeded successfully!'))
+        lines.append(self.style.SUCCESS(f'   Created {len(permissions)} permissions'))
+        lines.append(self.style.SUCCESS(f'   Created {len(rp_objs)} role mappings'))
+        self.stdout.write('\n'.join(lines))
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-15 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userpermission",
+            index=models.Index(
+                fields=["user", "granted"], name="user_perm_user_granted_idx"
+            ),
+        ),
+    ]
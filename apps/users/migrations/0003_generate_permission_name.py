@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-15 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_add_permission_indexes"),
+    ]
+
+    # A column can't be altered into a generated one, so it is dropped and
+    # re-added; the database recomputes every name from resource and action.
+    operations = [
+        migrations.RemoveField(
+            model_name="permission",
+            name="name",
+        ),
+        migrations.AddField(
+            model_name="permission",
+            name="name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Func(
+                    models.F("resource"),
+                    models.Value(":"),
+                    models.F("action"),
+                    arg_joiner=" || ",
+                    template="%(expressions)s",
+                ),
+                help_text="Unique permission name in format resource:action",
+                output_field=models.CharField(max_length=100),
+                unique=True,
+                verbose_name="Permission Name",
+            ),
+        ),
+    ]
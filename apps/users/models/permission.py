@@ -30,9 +30,15 @@ class Permission(BaseModel):
         help_text='Action name (e.g., create, read, update, delete)'
     )
 
-    # Human-readable info
-    name = models.CharField(
-        max_length=100,
+    # Human-readable info, computed by the database from resource and action
+    name = models.GeneratedField(
+        expression=models.Func(
+            models.F('resource'), models.Value(':'), models.F('action'),
+            template='%(expressions)s',
+            arg_joiner=' || '
+        ),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
         unique=True,
         verbose_name='Permission Name',
         help_text='Unique permission name in format resource:action'
@@ -52,12 +58,6 @@ class Permission(BaseModel):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        """Auto-generate name from resource:action if not provided."""
-        if not self.name:
-            self.name = f"{self.resource}:{self.action}"
-        super().save(*args, **kwargs)
-
 
 class RolePermission(BaseModel):
     """
@@ -120,6 +120,10 @@ class UserPermission(BaseModel):
         verbose_name_plural = 'User Permissions'
         unique_together = [['user', 'permission']]
         ordering = ['user', 'permission']
+        indexes = [
+            # Granted/revoked overrides of a user, read on permission checks
+            models.Index(fields=['user', 'granted'], name='user_perm_user_granted_idx'),
+        ]
 
     def __str__(self):
         action = 'granted' if self.granted else 'revoked'
@@ -0,0 +1,23 @@
+"""Signal handlers for the users app."""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.users.models import User, Permission, RolePermission
+from core.authentication import auth_user_cache_key
+from core.permissions.shield import shield
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_auth_user_cache(sender, instance, **kwargs):
+    """Drop the cached JWT user so role/is_active changes apply on the next request."""
+    cache_key = auth_user_cache_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=RolePermission)
+def invalidate_role_permissions_cache(sender, instance, **kwargs):
+    """Drop the cached role -> permissions mapping so role changes apply immediately."""
+    transaction.on_commit(shield.clear_cache)
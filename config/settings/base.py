@@ -106,6 +106,21 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        # Must be True behind pgbouncer in transaction pooling mode
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
+    }
+}
+
+# Cache (order detail payloads, see apps/orders/cache.py)
+# NOTE: locmem is per-process; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache + redis://...) in production
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='be-seafood'),
     }
 }
 
@@ -163,6 +178,12 @@ SOCKETIO_SERVER_URL = config(
     'SOCKETIO_SERVER_URL',
     default='http://localhost:4000'
 )
+# Unix domain socket of a Socket.IO server on the same host (empty: use TCP)
+SOCKETIO_SERVER_SOCKET = config('SOCKETIO_SERVER_SOCKET', default='')
+# Send broadcasts inline on commit instead of on the background pool (debugging)
+SOCKETIO_BROADCAST_SYNC = config('SOCKETIO_BROADCAST_SYNC', default=False, cast=bool)
+# Send all broadcasts of a transaction as one POST to /broadcast/batch
+SOCKETIO_BATCH_BROADCASTS = config('SOCKETIO_BATCH_BROADCASTS', default=False, cast=bool)
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -1,11 +1,33 @@
 """JWT Authentication for Django Ninja."""
 from typing import Optional
 import jwt
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
 from ninja.security import HttpBearer
 from apps.users.models.user import User
 
+# Seconds an authenticated user is cached (invalidated on save/delete, see apps/users/signals.py)
+AUTH_USER_CACHE_TIMEOUT = 300
+
+# User fields kept in the auth cache. Never the password hash: the cache may be
+# shared (Redis); any other field is loaded on first access.
+AUTH_USER_CACHE_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'role', 'is_active', 'is_staff', 'is_superuser',
+)
+
+# The cached fields in model field order, as Model.from_db() expects them
+_AUTH_USER_CACHE_ATTNAMES = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in AUTH_USER_CACHE_FIELDS
+)
+
+
+def auth_user_cache_key(user_id: int) -> str:
+    return f'user:{user_id}:auth:fields'
+
 
 class JWTAuth(HttpBearer):
     """JWT authentication class for Django Ninja."""
@@ -30,8 +52,16 @@ class JWTAuth(HttpBearer):
             if not user_id:
                 return None
 
-            # Fetch user from database
-            user = User.objects.get(id=user_id, is_active=True)
+            # Fetch user from cache, falling back to the database
+            cache_key = auth_user_cache_key(user_id)
+            values = cache.get(cache_key)
+            if values is None:
+                user = User.objects.get(id=user_id, is_active=True)
+                values = [getattr(user, field) for field in _AUTH_USER_CACHE_ATTNAMES]
+                cache.set(cache_key, values, AUTH_USER_CACHE_TIMEOUT)
+            else:
+                # Same as a row loaded with .only(*AUTH_USER_CACHE_FIELDS)
+                user = User.from_db(User.objects.db, _AUTH_USER_CACHE_ATTNAMES, values)
 
             # Attach user to request for Django compatibility
             request.user = user
@@ -50,3 +80,10 @@ class JWTAuth(HttpBearer):
         except Exception:
             # Any other error
             return None
+
+
+class AsyncJWTAuth(JWTAuth):
+    """JWTAuth for async operations: the user lookup runs off the event loop."""
+
+    async def authenticate(self, request: HttpRequest, token: str) -> Optional[User]:
+        return await sync_to_async(super().authenticate)(request, token)
@@ -0,0 +1,7 @@
+"""Enums."""
+from .base_enum import OrderStatus, UserRole
+
+__all__ = [
+    'OrderStatus',
+    'UserRole'
+]
@@ -122,11 +122,17 @@ class UserRole(str, Enum):
     @classmethod
     def can_transition(cls, role, from_status, to_status):
         """Check if role can transition from one status to another."""
-        allowed_statuses = cls.get_allowed_statuses(role)
-
         # Admin và Manager có thể chuyển bất kỳ trạng thái nào
         if role in [cls.ADMIN, cls.MANAGER]:
             return True
 
         # Check if both statuses are in allowed list
+        allowed_statuses = _ROLE_ALLOWED_STATUS_SETS.get(role, frozenset())
         return from_status in allowed_statuses and to_status in allowed_statuses
+
+
+# Allowed status values per role value, precomputed for can_transition
+_ROLE_ALLOWED_STATUS_SETS = {
+    role.value: frozenset(status.value for status in UserRole.get_allowed_statuses(role))
+    for role in UserRole
+}
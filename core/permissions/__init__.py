@@ -5,6 +5,7 @@ from .decorators import (
     require_any_permission,
     require_all_permissions,
     require_role,
+    has,
     check_permission
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     'require_any_permission',
     'require_all_permissions',
     'require_role',
+    'has',
     'check_permission'
 ]
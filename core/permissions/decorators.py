@@ -12,12 +12,65 @@ Usage:
     def create_order(request, payload):
         ...
 """
-from functools import wraps
+import asyncio
+import sys
+from functools import partial, wraps
+from asgiref.sync import sync_to_async
 from typing import Callable, Union, List
 from ninja.errors import HttpError
 from core.permissions.shield import shield
 
 
+def _guard(
+    func: Callable,
+    allowed: Callable,
+    msg: str,
+    needs_db: bool = True,
+    takes_user: bool = False
+) -> Callable:
+    """
+    Wrap a view so it raises 403 with msg unless the check passes.
+
+    allowed is called with request.user when takes_user is set, otherwise
+    with the request. The wrapper for each case is picked here, once, so
+    the per-request path has no branching and no extra frame.
+
+    Async views get an async wrapper. Their check runs on the event loop
+    once the user's permissions are loaded (see shield.is_loaded); only the
+    first, database-backed one goes through sync_to_async.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(request, *args, **kwargs):
+            arg = request.user if takes_user else request
+            if not needs_db or shield.is_loaded(request.user):
+                ok = allowed(arg)
+            else:
+                ok = await sync_to_async(allowed)(arg)
+            if not ok:
+                raise HttpError(403, msg)
+
+            return await func(request, *args, **kwargs)
+        return async_wrapper
+
+    if takes_user:
+        @wraps(func)
+        def user_wrapper(request, *args, **kwargs):
+            if not allowed(request.user):
+                raise HttpError(403, msg)
+
+            return func(request, *args, **kwargs)
+        return user_wrapper
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        if not allowed(request):
+            raise HttpError(403, msg)
+
+        return func(request, *args, **kwargs)
+    return wrapper
+
+
 def require_permission(permission_name: str, error_message: str = None):
     """
     Decorator to require a specific permission.
@@ -31,17 +84,13 @@ def require_permission(permission_name: str, error_message: str = None):
         def create_order(request, payload):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
-            user = request.user
+    # Resolved once at decoration time, not on every request
+    msg = error_message or f"Permission denied: {permission_name}"
+    # Bound with the name once; partial calls straight into can_request
+    allowed = partial(shield.can_request, permission_name=sys.intern(permission_name))
 
-            if not shield.can(user, permission_name):
-                msg = error_message or f"Permission denied: {permission_name}"
-                raise HttpError(403, msg)
-
-            return func(request, *args, **kwargs)
-        return wrapper
+    def decorator(func: Callable):
+        return _guard(func, allowed, msg)
     return decorator
 
 
@@ -58,17 +107,13 @@ def require_any_permission(*permission_names: str, error_message: str = None):
         def create_order(request, payload):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
-            user = request.user
+    msg = error_message or f"Permission denied: requires any of {permission_names}"
+    permission_names = tuple(map(sys.intern, permission_names))
+    # Required mask precomputed once per permission bit layout
+    has_any = shield.compile_check(permission_names, require_all=False)
 
-            if not shield.has_any(user, *permission_names):
-                msg = error_message or f"Permission denied: requires any of {permission_names}"
-                raise HttpError(403, msg)
-
-            return func(request, *args, **kwargs)
-        return wrapper
+    def decorator(func: Callable):
+        return _guard(func, has_any, msg, takes_user=True)
     return decorator
 
 
@@ -85,17 +130,12 @@ def require_all_permissions(*permission_names: str, error_message: str = None):
         def update_and_assign_order(request, order_id, payload):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
-            user = request.user
+    msg = error_message or f"Permission denied: requires all of {permission_names}"
+    permission_names = tuple(map(sys.intern, permission_names))
+    has_all = shield.compile_check(permission_names, require_all=True)
 
-            if not shield.has_all(user, *permission_names):
-                msg = error_message or f"Permission denied: requires all of {permission_names}"
-                raise HttpError(403, msg)
-
-            return func(request, *args, **kwargs)
-        return wrapper
+    def decorator(func: Callable):
+        return _guard(func, has_all, msg, takes_user=True)
     return decorator
 
 
@@ -112,24 +152,45 @@ def require_role(*roles: str, error_message: str = None):
         def admin_only_action(request):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
-            user = request.user
+    msg = error_message or f"Access denied: requires role in {roles}"
+    allowed_roles = frozenset(getattr(role, 'value', role) for role in roles)
 
-            if user.role not in roles:
-                msg = error_message or f"Access denied: requires role in {roles}"
-                raise HttpError(403, msg)
+    def allowed(user) -> bool:
+        return user.role in allowed_roles
 
-            return func(request, *args, **kwargs)
-        return wrapper
+    def decorator(func: Callable):
+        # Only reads the role, never needs the database
+        return _guard(func, allowed, msg, needs_db=False, takes_user=True)
     return decorator
 
 
+def has(request, permission_name: str) -> bool:
+    """
+    Check a permission for request.user inside a route (not a decorator).
+    Results are remembered on the request, see shield.can_request.
+
+    Args:
+        request: Django HTTP request
+        permission_name: Permission to check
+
+    Returns:
+        bool: True if the user has the permission
+
+    Example:
+        def my_route(request):
+            if has(request, 'order:delete'):
+                # user can delete
+                ...
+    """
+    return shield.can_request(request, permission_name)
+
+
 def check_permission(permission_name: str) -> Callable:
     """
     Function-based permission checker (not a decorator).
-    Use this inside route functions for conditional logic.
+
+    Deprecated: use has(request, permission_name), which checks directly
+    instead of building a checker first.
 
     Args:
         permission_name: Permission to check
@@ -143,6 +204,4 @@ def check_permission(permission_name: str) -> Callable:
                 # user can delete
                 ...
     """
-    def checker(request):
-        return shield.can(request.user, permission_name)
-    return checker
+    return partial(has, permission_name=sys.intern(permission_name))
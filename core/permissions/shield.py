@@ -6,23 +6,54 @@ Provides a clean API for checking permissions:
     - shield.can(user, 'order:update', order_id)
     - @shield.require('order:delete')
 """
-from typing import Optional, Any
+import sys
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Optional, Any, Callable, Dict, Iterable, Tuple
 from django.contrib.auth import get_user_model
-from apps.users.models import Permission, RolePermission, UserPermission
+from django.core.cache import cache
+from django.db.models import QuerySet
+from apps.users.models import Permission, UserPermission
 from core.enums import UserRole
 
 User = get_user_model()
 
+# ({permission name: bit}, {role: mask of its permissions}, {permission name: id}),
+# shared between processes through the cache. Bits follow sorted permission names.
+ROLE_PERMISSIONS_CACHE_KEY = 'shield:permissions'
+ROLE_PERMISSIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Bumped by clear_cache() (on Permission/RolePermission changes, see
+# apps/users/signals.py); every worker reloads once it sees a new version
+ROLE_PERMISSIONS_VERSION_KEY = 'shield:rolever'
+
+# Distinct (names, strict) combinations whose required mask is kept per version
+REQUIRED_MASK_CACHE_SIZE = 4096
+
+PermissionMasks = Tuple[Dict[str, int], Dict[str, int]]
+PermissionTables = Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]
+
+# Roles that hold every permission
+_SUPERUSER_ROLES = frozenset({UserRole.ADMIN.value, UserRole.MANAGER.value})
+
 
 class Shield:
     """
     Shield permission checker - centralized permission management.
     """
 
+    # A single instance consulted on every request
+    __slots__ = ('_permission_tables', '_required_masks', '_lock')
+
     def __init__(self):
         """Initialize Shield with permission cache."""
-        self._permission_cache = {}
-        self._role_permission_cache = {}
+        # Both are only ever replaced, never mutated, so readers need no lock
+        self._permission_tables: Optional[Tuple[int, PermissionTables]] = None
+        # (bits, lru-cached _mask_for bound to those bits) for the loaded version
+        self._required_masks: Optional[Tuple[Dict[str, int], Callable[..., Optional[int]]]] = None
+        # Serializes (re)loading the tables
+        self._lock = threading.Lock()
 
     def can(
         self,
@@ -46,16 +77,34 @@ class Shield:
             shield.can(user, 'order:update', order_id=123)
         """
         # Admin and Manager have all permissions
-        if user.role in [UserRole.ADMIN.value, UserRole.MANAGER.value]:
+        if user.role in _SUPERUSER_ROLES:
             return True
 
-        # Check user-specific permission overrides first
-        user_perm = self._check_user_permission(user, permission_name)
-        if user_perm is not None:
-            return user_perm
+        # Hot path: read the memoized mask directly instead of going
+        # through _get_user_mask, which is only needed on the first check
+        try:
+            bits, mask = user._shield_mask
+        except AttributeError:
+            bits, mask = self._get_user_mask(user)
+        return (mask & bits.get(permission_name, 0)) != 0
 
-        # Check role-based permissions
-        return self._check_role_permission(user.role, permission_name)
+    def can_request(self, request: Any, permission_name: str) -> bool:
+        """
+        can() for request.user, remembered on the request so stacked
+        decorators and in-view checks of the same permission evaluate it
+        only once per request.
+
+        Example:
+            shield.can_request(request, 'order:delete')
+        """
+        results = getattr(request, '_shield_can_cache', None)
+        if results is None:
+            results = request._shield_can_cache = {}
+
+        result = results.get(permission_name)
+        if result is None:
+            result = results[permission_name] = self.can(request.user, permission_name)
+        return result
 
     def cannot(
         self,
@@ -80,7 +129,11 @@ class Shield:
         Example:
             shield.has_any(user, 'order:create', 'order:update')
         """
-        return any(self.can(user, perm) for perm in permission_names)
+        if user.role in _SUPERUSER_ROLES:
+            return bool(permission_names)
+
+        bits, mask = self._get_user_mask(user)
+        return bool(mask & self._get_required_mask(bits, permission_names))
 
     def has_all(self, user: User, *permission_names: str) -> bool:
         """
@@ -96,7 +149,114 @@ class Shield:
         Example:
             shield.has_all(user, 'order:create', 'order:update')
         """
-        return all(self.can(user, perm) for perm in permission_names)
+        if user.role in _SUPERUSER_ROLES:
+            return True
+
+        bits, mask = self._get_user_mask(user)
+        required = self._get_required_mask(bits, permission_names, strict=True)
+        if required is None:
+            return False
+        return mask & required == required
+
+    def compile_check(self, permission_names: Tuple[str, ...], require_all: bool) -> Callable[[User], bool]:
+        """
+        Build a has_all (require_all) or has_any check for fixed permission
+        names, e.g. once per decorator. The required mask is computed on the
+        first call and reused until the permission bits change, so a check
+        is one AND (and compare) against the user's mask.
+
+        Example:
+            can_manage = shield.compile_check(('order:update', 'order:delete'), require_all=True)
+            can_manage(user)
+        """
+        # (bits, required mask) it was last computed for, swapped as a whole
+        snapshot: Tuple[Optional[Dict[str, int]], Optional[int]] = (None, None)
+
+        def check(user: User) -> bool:
+            nonlocal snapshot
+            if user.role in _SUPERUSER_ROLES:
+                return require_all or bool(permission_names)
+
+            bits, mask = self._get_user_mask(user)
+            snapshot_bits, required = snapshot
+            if snapshot_bits is not bits:
+                required = self._mask_for(bits, permission_names, strict=require_all)
+                snapshot = (bits, required)
+
+            if require_all:
+                return required is not None and mask & required == required
+            return bool(mask & required)
+
+        return check
+
+    def can_batch(self, user: User, permission_names: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check several permissions at once.
+
+        Args:
+            user: User object
+            permission_names: Permission names to check
+
+        Returns:
+            dict: {permission_name: bool} for every name given
+
+        Example:
+            shield.can_batch(user, ['order:update', 'order:delete'])
+        """
+        if user.role in _SUPERUSER_ROLES:
+            return dict.fromkeys(permission_names, True)
+
+        bits, mask = self._get_user_mask(user)
+        return {name: bool(mask & bits.get(name, 0)) for name in permission_names}
+
+    def filter_granted(self, user: User, permission_names: Iterable[str]) -> set[str]:
+        """
+        Get which of the given permissions the user has.
+
+        Args:
+            user: User object
+            permission_names: Permission names to check
+
+        Returns:
+            set: The subset of permission_names the user has
+
+        Example:
+            shield.filter_granted(user, ['order:update', 'order:delete'])
+        """
+        if user.role in _SUPERUSER_ROLES:
+            return set(permission_names)
+
+        bits, mask = self._get_user_mask(user)
+        return {name for name in permission_names if mask & bits.get(name, 0)}
+
+    def filter_allowed(
+        self,
+        user: User,
+        permission_name: str,
+        queryset: QuerySet,
+        owner_field: Optional[str] = None
+    ) -> QuerySet:
+        """
+        Narrow a queryset to the rows a user may access, in the same query.
+
+        With the permission the queryset is returned unchanged; without it,
+        only rows linked to the user through owner_field remain (none when
+        there is no owner_field). Replaces a can() check per row.
+
+        Args:
+            user: User object
+            permission_name: Permission granting access to every row
+            queryset: Rows to filter
+            owner_field: Lookup linking a row to its user, e.g. 'assigned_to'
+
+        Example:
+            orders = shield.filter_allowed(user, 'order:view_all', Order.objects.all(), 'assigned_to')
+        """
+        if self.can(user, permission_name):
+            return queryset
+        if owner_field is None:
+            return queryset.none()
+        return queryset.filter(**{owner_field: user})
 
     def get_user_permissions(self, user: User) -> list[str]:
         """
@@ -106,47 +266,175 @@ class Shield:
             list: List of permission names user has access to
         """
         # Admin and Manager have all permissions
-        if user.role in [UserRole.ADMIN.value, UserRole.MANAGER.value]:
-            return list(Permission.objects.values_list('name', flat=True))
-
-        # Get role permissions
-        role_perms = set(
-            RolePermission.objects
-            .filter(role=user.role)
-            .select_related('permission')
-            .values_list('permission__name', flat=True)
-        )
+        if user.role in _SUPERUSER_ROLES:
+            bits, _ = self._get_permission_masks()
+            return list(bits)
+
+        bits, mask = self._get_user_mask(user)
+        return [name for name, bit in bits.items() if mask & bit]
+
+    def _get_version(self) -> int:
+        """Get the current permissions version, starting one if there is none."""
+        # Seeded from the clock so an evicted version never reuses old entries
+        return cache.get_or_set(ROLE_PERMISSIONS_VERSION_KEY, lambda: int(time.time()), None)
+
+    def is_loaded(self, user: User) -> bool:
+        """
+        Whether checks for this user can be answered without the database:
+        superusers, or users whose permissions were loaded this request.
+        """
+        return user.role in _SUPERUSER_ROLES or getattr(user, '_shield_mask', None) is not None
 
-        # Apply user-specific overrides
-        user_perms = UserPermission.objects.filter(user=user).select_related('permission')
-        for up in user_perms:
-            if up.granted:
-                role_perms.add(up.permission.name)
+    def prefetch(self, users: Iterable[User]) -> None:
+        """
+        Load the effective permissions of several users with one query,
+        so checks on any of them afterwards don't query the database.
+        Users already loaded in this request are skipped.
+
+        Example:
+            shield.prefetch(order.assigned_to.all())
+        """
+        pending: Dict[int, list] = {}
+        for user in users:
+            if getattr(user, '_shield_mask', None) is None:
+                pending.setdefault(user.pk, []).append(user)
+        if not pending:
+            return
+
+        bits, role_masks = self._get_permission_masks()
+        masks = {pk: role_masks.get(same_users[0].role, 0) for pk, same_users in pending.items()}
+
+        overrides = UserPermission.objects.filter(
+            user_id__in=pending
+        ).values_list('user_id', 'permission__name', 'granted')
+        for user_id, permission_name, granted in overrides:
+            bit = bits.get(permission_name, 0)
+            if granted:
+                masks[user_id] |= bit
             else:
-                role_perms.discard(up.permission.name)
+                masks[user_id] &= ~bit
 
-        return list(role_perms)
+        for pk, same_users in pending.items():
+            for user in same_users:
+                user._shield_mask = (bits, masks[pk])
 
-    def _check_user_permission(self, user: User, permission_name: str) -> Optional[bool]:
+    def _get_permission_tables(self) -> PermissionTables:
         """
-        Check user-specific permission override.
+        Get the permission bits, the permission mask of every role and the
+        permission ids by name.
 
-        Returns:
-            bool: True/False if override exists, None if no override
+        All three are built from a single Permission/RolePermission query
+        and kept in process and in the Django cache, under the current version.
         """
-        try:
-            permission = Permission.objects.get(name=permission_name)
-            user_perm = UserPermission.objects.filter(
-                user=user,
-                permission=permission
-            ).first()
-
-            if user_perm:
-                return user_perm.granted
-        except Permission.DoesNotExist:
-            pass
+        # Lock-free read of an immutable snapshot; only a (re)load takes the lock
+        version = self._get_version()
+        current = self._permission_tables
+        if current is None or current[0] != version:
+            with self._lock:
+                current = self._permission_tables
+                if current is None or current[0] != version:
+                    tables = self._load_permission_tables(version)
+                    # A new version starts an empty cache; the old one is dropped with it
+                    bits = tables[0]
+                    required_mask = lru_cache(maxsize=REQUIRED_MASK_CACHE_SIZE)(partial(self._mask_for, bits))
+                    self._required_masks = (bits, required_mask)
+                    self._permission_tables = current = (version, tables)
+
+        return current[1]
+
+    def _load_permission_tables(self, version: int) -> PermissionTables:
+        """Read the tables of a permissions version from the cache, or build them."""
+        cache_key = f'{ROLE_PERMISSIONS_CACHE_KEY}:v{version}'
+        tables = cache.get(cache_key)
+        if tables is None:
+            # One LEFT JOIN: a row per (permission, role holding it), or
+            # a single row with role None for a permission no role has
+            rows = Permission.objects.order_by('name').values_list('name', 'id', 'role_permissions__role')
+            ids: Dict[str, int] = {}
+            bits: Dict[str, int] = {}
+            role_masks: Dict[str, int] = {}
+            for permission_name, permission_id, role_name in rows:
+                bit = bits.get(permission_name)
+                if bit is None:
+                    bit = bits[permission_name] = 1 << len(bits)
+                    ids[permission_name] = permission_id
+                if role_name is not None:
+                    role_masks[role_name] = role_masks.get(role_name, 0) | bit
+            tables = (bits, role_masks, ids)
+            cache.set(cache_key, tables, ROLE_PERMISSIONS_CACHE_TIMEOUT)
+
+        # Intern the names (fresh strings from the DB or unpickled from the
+        # cache) so lookups with the interned names the decorators hold
+        # match on identity before comparing characters
+        bits, role_masks, ids = tables
+        return (
+            {sys.intern(name): bit for name, bit in bits.items()},
+            {sys.intern(role): mask for role, mask in role_masks.items()},
+            {sys.intern(name): permission_id for name, permission_id in ids.items()},
+        )
+
+    def _get_permission_masks(self) -> PermissionMasks:
+        """Get the permission bits and the permission mask of every role."""
+        bits, role_masks, _ = self._get_permission_tables()
+        return bits, role_masks
+
+    def _get_permission_id(self, permission_name: str) -> Optional[int]:
+        """Get a permission's id by name, None if it doesn't exist."""
+        _, _, ids = self._get_permission_tables()
+        return ids.get(permission_name)
+
+    def _get_required_mask(
+        self,
+        bits: Dict[str, int],
+        permission_names: Tuple[str, ...],
+        strict: bool = False
+    ) -> Optional[int]:
+        """
+        Get the combined mask of permission_names (see _mask_for), cached
+        per permissions version since decorators ask for the same names
+        on every request.
+        """
+        required_masks = self._required_masks
+        if required_masks is not None and required_masks[0] is bits:
+            return required_masks[1](permission_names, strict)
+        return self._mask_for(bits, permission_names, strict)
 
-        return None
+    def _mask_for(
+        self,
+        bits: Dict[str, int],
+        permission_names: Iterable[str],
+        strict: bool = False
+    ) -> Optional[int]:
+        """
+        Combine permission names into one mask.
+
+        Unknown names are skipped, or make the result None when strict.
+        """
+        mask = 0
+        for name in permission_names:
+            bit = bits.get(name)
+            if bit is None:
+                if strict:
+                    return None
+                continue
+            mask |= bit
+        return mask
+
+    def _get_user_mask(self, user: User) -> Tuple[Dict[str, int], int]:
+        """
+        Get the mask of a user's effective permissions: the role's
+        permissions with the user's grant/revoke overrides applied,
+        together with the permission bits it was built from.
+
+        Memoized on the user instance, so every check made with the same
+        request.user after the first one is answered without a query or
+        a cache round-trip.
+        """
+        cached = getattr(user, '_shield_mask', None)
+        if cached is None:
+            self.prefetch([user])
+            cached = user._shield_mask
+        return cached
 
     def _check_role_permission(self, role: str, permission_name: str) -> bool:
         """
@@ -159,24 +447,8 @@ class Shield:
         Returns:
             bool: True if role has permission
         """
-        # Use cache key
-        cache_key = f"{role}:{permission_name}"
-        if cache_key in self._role_permission_cache:
-            return self._role_permission_cache[cache_key]
-
-        # Query database
-        try:
-            permission = Permission.objects.get(name=permission_name)
-            has_permission = RolePermission.objects.filter(
-                role=role,
-                permission=permission
-            ).exists()
-
-            # Cache result
-            self._role_permission_cache[cache_key] = has_permission
-            return has_permission
-        except Permission.DoesNotExist:
-            return False
+        bits, role_masks = self._get_permission_masks()
+        return bool(role_masks.get(role, 0) & bits.get(permission_name, 0))
 
     def grant(self, user: User, permission_name: str) -> bool:
         """
@@ -189,16 +461,7 @@ class Shield:
         Returns:
             bool: True if granted successfully
         """
-        try:
-            permission = Permission.objects.get(name=permission_name)
-            UserPermission.objects.update_or_create(
-                user=user,
-                permission=permission,
-                defaults={'granted': True}
-            )
-            return True
-        except Permission.DoesNotExist:
-            return False
+        return self._set_override(user, permission_name, True)
 
     def revoke(self, user: User, permission_name: str) -> bool:
         """
@@ -211,21 +474,65 @@ class Shield:
         Returns:
             bool: True if revoked successfully
         """
-        try:
-            permission = Permission.objects.get(name=permission_name)
-            UserPermission.objects.update_or_create(
-                user=user,
-                permission=permission,
-                defaults={'granted': False}
-            )
-            return True
-        except Permission.DoesNotExist:
+        return self._set_override(user, permission_name, False)
+
+    def grant_many(self, user: User, permission_names: Iterable[str]) -> int:
+        """
+        Grant several permissions to a user (overrides) in one query.
+
+        Args:
+            user: User object
+            permission_names: Permission names, unknown names are skipped
+
+        Returns:
+            int: Number of permissions granted
+
+        Example:
+            shield.grant_many(user, ['order:delete', 'report:export'])
+        """
+        _, _, ids = self._get_permission_tables()
+        permission_ids = {ids[name] for name in permission_names if name in ids}
+        self._upsert_overrides(user, permission_ids, True)
+        return len(permission_ids)
+
+    def _set_override(self, user: User, permission_name: str, granted: bool) -> bool:
+        """Store a user's grant/revoke override for a permission."""
+        permission_id = self._get_permission_id(permission_name)
+        if permission_id is None:
             return False
 
+        self._upsert_overrides(user, [permission_id], granted)
+        return True
+
+    def _upsert_overrides(self, user: User, permission_ids: Iterable[int], granted: bool) -> None:
+        """
+        Insert or update a user's overrides with a single
+        INSERT ... ON CONFLICT (user, permission) DO UPDATE.
+        """
+        overrides = [
+            UserPermission(user=user, permission_id=permission_id, granted=granted)
+            for permission_id in permission_ids
+        ]
+        if overrides:
+            UserPermission.objects.bulk_create(
+                overrides,
+                update_conflicts=True,
+                unique_fields=['user', 'permission'],
+                update_fields=['granted', 'updated_at']
+            )
+
+        user.__dict__.pop('_shield_mask', None)
+
     def clear_cache(self):
         """Clear permission cache."""
-        self._permission_cache.clear()
-        self._role_permission_cache.clear()
+        with self._lock:
+            self._permission_tables = None
+            self._required_masks = None
+        try:
+            cache.incr(ROLE_PERMISSIONS_VERSION_KEY)
+        except ValueError:
+            # No version yet; the next lookup starts one
+            pass
 
 
 # Global Shield instance
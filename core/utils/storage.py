@@ -0,0 +1,31 @@
+"""Storage utilities."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Background workers so storage round-trips (disk / object storage) stay off the request thread
+_storage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='storage-delete')
+
+
+def _delete_file(name: str, storage: Storage) -> None:
+    try:
+        storage.delete(name)
+    except Exception:
+        logger.exception(f"Failed to delete stored file {name}")
+
+
+def delete_file_after_commit(name: str, storage: Storage = default_storage) -> None:
+    """
+    Delete a stored file in the background once the current transaction
+    commits (immediately when not inside an atomic block).
+
+    Args:
+        name: File name in the storage (FieldFile.name)
+        storage: Storage holding the file (FieldFile.storage)
+    """
+    if name:
+        transaction.on_commit(lambda: _storage_executor.submit(_delete_file, name, storage))